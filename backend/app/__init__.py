@@ -2,6 +2,7 @@ from quart import Quart
 from quart_cors import cors
 from app.routes import register_blueprints
 from app.utils.keep_alive import keep_db_alive  # ✅ this still works
+from app.utils.activity_log import flush_activity_logs
 from app.database import SessionLocal
 from sqlalchemy import text
 import asyncio
@@ -42,10 +43,16 @@ def create_app():
     app.config.setdefault("STORAGE_VENDOR", "disk")  # "disk" | "b2"
     register_blueprints(app)
 
+    # Handlers don't close their sessions; release the request's session here
+    @app.teardown_appcontext
+    async def remove_session(exception=None):
+        SessionLocal.remove()
+
     #✅ Before serving: warm up DB, then start keep-alive
     @app.before_serving
     async def startup():
         await warmup_db()
         app.add_background_task(keep_db_alive)
+        app.add_background_task(flush_activity_logs)
 
     return app
@@ -1,9 +1,146 @@
 from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from app.config import SQLALCHEMY_DATABASE_URI
+import asyncio
+import threading
 import os
+import shlex
 
-engine = create_engine(SQLALCHEMY_DATABASE_URI, echo=False, future=True)
+# Connection budget across every worker process and both engines, kept under
+# Postgres' default max_connections=100 with room for migrations and psql
+_WORKERS = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "80"))
+# Fewer than this and requests queue on a handful of connections
+_MIN_ENGINE_CONNECTIONS = 5
 
-SessionLocal = scoped_session(sessionmaker(bind=engine, autoflush=False, autocommit=False))
-Base = declarative_base()
\ No newline at end of file
+
+def _pool_options(connections):
+    """Pool settings for an engine allowed at most `connections` connections."""
+    pool_size = (connections + 1) // 2
+    return dict(
+        pool_size=pool_size,
+        max_overflow=connections - pool_size,
+        pool_pre_ping=True,   # drop dead connections (e.g. after a DB failover) before use
+        pool_recycle=1800,
+        pool_use_lifo=True,   # reuse the warmest connection; idle extras age out server-side
+    )
+
+
+# Leads and storage (the busiest routes) are on the async engine and the rest
+# are sync, so each process's share is split evenly between them
+_PROCESS_CONNECTIONS = _MAX_CONNECTIONS // _WORKERS
+_ASYNC_CONNECTIONS = max(_PROCESS_CONNECTIONS // 2, _MIN_ENGINE_CONNECTIONS)
+_SYNC_CONNECTIONS = max(_PROCESS_CONNECTIONS - _PROCESS_CONNECTIONS // 2, _MIN_ENGINE_CONNECTIONS)
+if _WORKERS * (_ASYNC_CONNECTIONS + _SYNC_CONNECTIONS) > _MAX_CONNECTIONS:
+    _sync, _async = _pool_options(_SYNC_CONNECTIONS), _pool_options(_ASYNC_CONNECTIONS)
+    print(
+        f"[DB] WARNING: {_WORKERS} workers x ({_SYNC_CONNECTIONS} sync + {_ASYNC_CONNECTIONS} async) "
+        f"connections exceeds DB_MAX_CONNECTIONS={_MAX_CONNECTIONS}. Per worker: "
+        f"sync pool_size={_sync['pool_size']} max_overflow={_sync['max_overflow']}, "
+        f"async pool_size={_async['pool_size']} max_overflow={_async['max_overflow']}. "
+        f"Lower WEB_CONCURRENCY or raise DB_MAX_CONNECTIONS."
+    )
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URI,
+    echo=False,
+    future=True,
+    **_pool_options(_SYNC_CONNECTIONS),
+)
+
+
+# asyncpg keywords that can stay in the URL query as they are
+_ASYNCPG_QUERY_PARAMS = {"prepared_statement_cache_size", "target_session_attrs"}
+
+
+def _libpq_options(options):
+    """
+    Parse a libpq "options" string ("-c key=value --key=value") into
+    asyncpg server_settings.
+    """
+    settings = {}
+    args = shlex.split(options)
+    while args:
+        arg = args.pop(0)
+        if arg == "-c" and args:
+            arg = args.pop(0)
+        elif arg.startswith("-c"):
+            arg = arg[2:]
+        elif arg.startswith("--"):
+            arg = arg[2:]
+        else:
+            raise ValueError(f"Unsupported libpq option for asyncpg: {arg!r}")
+        key, sep, value = arg.partition("=")
+        if not sep:
+            raise ValueError(f"Unsupported libpq option for asyncpg: {arg!r}")
+        settings[key.replace("-", "_")] = value
+    return settings
+
+
+def _async_engine_args(uri):
+    """
+    The same database through its asyncio driver: asyncpg for PostgreSQL,
+    aiosqlite for SQLite. libpq-only URL parameters are translated to asyncpg
+    connect arguments; anything asyncpg can't take fails here, at startup,
+    instead of on the first connect.
+    """
+    url = make_url(uri)
+    connect_args = {}
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        query = dict(url.query)
+        server_settings = {}
+        if "sslmode" in query:
+            connect_args["ssl"] = query.pop("sslmode")
+        if "connect_timeout" in query:
+            connect_args["timeout"] = float(query.pop("connect_timeout"))
+        if "application_name" in query:
+            server_settings["application_name"] = query.pop("application_name")
+        if "options" in query:
+            server_settings.update(_libpq_options(query.pop("options")))
+        # asyncpg negotiates SCRAM itself and has no channel_binding switch
+        query.pop("channel_binding", None)
+        unsupported = sorted(set(query) - _ASYNCPG_QUERY_PARAMS)
+        if unsupported:
+            raise ValueError(
+                "Database URL parameters not supported by asyncpg: " + ", ".join(unsupported)
+            )
+        if server_settings:
+            connect_args["server_settings"] = server_settings
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url, connect_args
+
+
+_async_url, _async_connect_args = _async_engine_args(SQLALCHEMY_DATABASE_URI)
+# Used by the routes that have moved to AsyncSession (leads, storage); it keeps
+# its own pool next to the sync engine's.
+async_engine = create_async_engine(
+    _async_url,
+    echo=False,
+    connect_args=_async_connect_args,
+    **_pool_options(_ASYNC_CONNECTIONS),
+)
+# expire_on_commit=False: objects stay readable after commit without reloading
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+def _request_scope():
+    # Requests share one thread on the event loop, so scope sessions to the
+    # asyncio task handling the request; plain threads keep thread scope.
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return ("task", id(task))
+    return ("thread", threading.get_ident())
+
+
+SessionLocal = scoped_session(
+    sessionmaker(bind=engine, autoflush=False, autocommit=False),
+    scopefunc=_request_scope,
+)
+Base = declarative_base()
@@ -2,7 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKe
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
-from sqlalchemy import Enum, Index, UniqueConstraint, JSON
+from sqlalchemy import Enum, Index, UniqueConstraint, JSON, text
 import enum
 
 # Association table for many-to-many User ↔ Role
@@ -77,6 +77,14 @@ class Client(Base):
     assigned_user = relationship("User", foreign_keys=[assigned_to])
     created_by_user = relationship("User", foreign_keys=[created_by])
 
+    # Partial indexes for the "my active clients" filter in list_clients
+    __table_args__ = (
+        Index('ix_client_tenant_creator_active', 'tenant_id', 'created_by',
+              postgresql_where=text('deleted_at IS NULL')),
+        Index('ix_client_tenant_assignee_active', 'tenant_id', 'assigned_to',
+              postgresql_where=text('deleted_at IS NULL')),
+    )
+
     def __repr__(self):
         return f"<Client {self.name}>"
 
@@ -130,6 +138,12 @@ class Lead(Base):
     assigned_user = relationship("User", foreign_keys=[assigned_to])
     created_by_user = relationship("User", foreign_keys=[created_by])
 
+    __table_args__ = (
+        Index('ix_lead_tenant_creator_active', 'tenant_id', 'created_by',
+              postgresql_where=text('deleted_at IS NULL')),
+        Index('ix_lead_tenant_assignee_active', 'tenant_id', 'assigned_to',
+              postgresql_where=text('deleted_at IS NULL')),
+    )
 
     def __repr__(self):
         return f"<Lead {self.name}>"
@@ -230,6 +244,13 @@ class Interaction(Base):
     client = relationship("Client", backref="interactions")
     project = relationship("Project", backref="interactions")  # 🆕 NEW RELATIONSHIP
 
+    # Tenant-scoped lookups used by list_interactions (btree scans serve DESC too)
+    __table_args__ = (
+        Index('ix_interaction_tenant_date', 'tenant_id', 'contact_date'),
+        Index('ix_interaction_tenant_client', 'tenant_id', 'client_id'),
+        Index('ix_interaction_tenant_lead', 'tenant_id', 'lead_id'),
+    )
+
     def __repr__(self):
         return f"<Interaction {self.id} on {self.contact_date}>"
     
@@ -349,7 +370,7 @@ class File(Base):
             "name": self.filename,
             "size": self.size,
             "uploadedBy": self.uploader.email if self.uploader else None,
-            "date": (self.uploaded_at.isoformat() + "Z") if self.uploaded_at else None,
+            "date": self.uploaded_at,  # raw datetime; serialized by orjson_response
             "mimetype": self.mimetype,
         }
 
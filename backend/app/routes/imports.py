@@ -1,17 +1,70 @@
 from quart import Blueprint, request, jsonify, g, Response
-import pandas as pd
+import asyncio
+import hashlib
 import io
 import json
 from datetime import datetime
+from itertools import islice
+from sqlalchemy import insert
 from app.models import Lead, User
 from app.database import SessionLocal
 from app.utils.auth_utils import requires_auth
 from app.utils.phone_utils import clean_phone_number
+from app.utils.import_utils import read_preview, read_rows, validate_email
 from app.utils.email_utils import send_email
+from app.utils.orjson_response import orjson_response
+from app.utils.http_cache import make_etag, not_modified, set_etag
 from app.constants import TYPE_OPTIONS, LEAD_STATUS_OPTIONS, PHONE_LABELS
 
 imports_bp = Blueprint("imports", __name__, url_prefix="/api/import")
 
+VALIDATION_CHUNK_SIZE = 10_000
+PREVIEW_ROWS = 10
+
+# Case-insensitive lookups for choice fields, mapping to the canonical spelling
+_TYPE_LOOKUP = {t.lower(): t for t in TYPE_OPTIONS}
+_LEAD_STATUS_LOOKUP = {s.lower(): s for s in LEAD_STATUS_OPTIONS}
+_PHONE_LABEL_LOOKUP = {p.lower(): p for p in PHONE_LABELS}
+
+
+# Import cleaners take a stripped, non-empty cell value and return
+# (cleaned_value, warning). A cleaned_value of None drops the field.
+def _clean_phone(value):
+    cleaned = clean_phone_number(value)
+    if not cleaned:
+        return None, "Invalid phone"
+    return cleaned, None
+
+def _clean_email(value):
+    cleaned = validate_email(value)
+    if not cleaned:
+        return None, "Invalid email"
+    return cleaned, None
+
+def _keep(value):
+    return value, None
+
+def _choice_cleaner(lookup, default, label):
+    def clean(value):
+        match = lookup.get(value.lower())
+        if match is None:
+            return default, f"Unknown {label} '{value}'"
+        return match, None
+    return clean
+
+def _make_cleaner(lead_field):
+    if lead_field in ['phone', 'secondary_phone']:
+        return _clean_phone
+    elif lead_field == 'email':
+        return _clean_email
+    elif lead_field == 'type':
+        return _choice_cleaner(_TYPE_LOOKUP, "None", "business type")
+    elif lead_field == 'lead_status':
+        return _choice_cleaner(_LEAD_STATUS_LOOKUP, "open", "lead status")
+    elif lead_field.endswith("_label"):
+        return _choice_cleaner(_PHONE_LABEL_LOOKUP, "work", "phone label")
+    return _keep
+
 VALID_LEAD_FIELDS = {
     'name': {'required': True, 'type': 'string', 'max_length': 100},
     'contact_person': {'required': False, 'type': 'string', 'max_length': 100},
@@ -30,19 +83,92 @@ VALID_LEAD_FIELDS = {
     'lead_status': {'required': False, 'type': 'choice', 'choices': LEAD_STATUS_OPTIONS}
 }
 
-def read_file(file_storage):
-    filename = file_storage.filename.lower()
-    if filename.endswith(".csv"):
-        for encoding in ["utf-8", "latin1", "cp1252"]:
-            try:
-                return pd.read_csv(file_storage.stream, encoding=encoding)
-            except UnicodeDecodeError:
-                continue
-        raise ValueError("Could not decode CSV file")
-    elif filename.endswith(".xlsx"):
-        return pd.read_excel(file_storage.stream)
-    else:
-        raise ValueError("Unsupported file format")
+
+def _make_validator(field_name, field_config):
+    """
+    Build a validator for one VALID_LEAD_FIELDS entry. The validator takes a
+    cleaned value and returns an error message, or None if the value is valid.
+    """
+    if field_config['type'] == 'choice':
+        choices = frozenset(field_config['choices'])
+        def validate(value):
+            if value not in choices:
+                return f"Invalid value '{value}' for {field_name}"
+            return None
+        return validate
+
+    max_length = field_config.get('max_length')
+    if max_length:
+        def validate(value):
+            if len(value) > max_length:
+                return f"{field_name} exceeds {max_length} characters"
+            return None
+        return validate
+
+    return None
+
+# Compiled once; fields without constraints (e.g. notes) have no entry
+_VALIDATORS = {
+    field_name: validator
+    for field_name, field_config in VALID_LEAD_FIELDS.items()
+    if (validator := _make_validator(field_name, field_config))
+}
+
+
+def _validate_rows(indexed_rows, active_mappings, lead_defaults):
+    """
+    Clean and validate (index, row) pairs without touching the database.
+    Returns (lead mappings ready to insert, failures, warnings).
+    """
+    valid = []
+    failures = []
+    warnings = set()
+
+    for idx, row in indexed_rows:
+        try:
+            lead_data = {}
+            for csv_col, lead_field, clean in active_mappings:
+                val = row.get(csv_col)
+                if val is None:
+                    continue
+                val = str(val).strip()
+                if not val:
+                    continue
+                if clean is None:
+                    raise ValueError(f"Unknown lead field '{lead_field}'")
+
+                cleaned, warning = clean(val)
+                if warning:
+                    warnings.add(f"{warning} on row {idx + 2}")
+                if cleaned is None:
+                    continue
+                lead_data[lead_field] = cleaned
+
+            if not lead_data.get("name"):
+                raise ValueError("Missing required 'name' field")
+
+            for field, value in lead_data.items():
+                validate = _VALIDATORS.get(field)
+                if validate and (error := validate(value)):
+                    raise ValueError(error)
+
+            lead_data.setdefault("type", "None")
+            lead_data.setdefault("lead_status", "open")
+            if "phone" in lead_data and "phone_label" not in lead_data:
+                lead_data["phone_label"] = "work"
+            if "secondary_phone" in lead_data and "secondary_phone_label" not in lead_data:
+                lead_data["secondary_phone_label"] = "mobile"
+
+            # Server-set values (tenant, owner, assignee) always win over row data
+            valid.append({**lead_data, **lead_defaults})
+        except Exception as e:
+            failures.append({
+                "row": idx + 2,
+                "data": {k: v for k, v in row.items() if k is not None and v not in (None, '')},
+                "error": str(e)
+            })
+
+    return valid, failures, warnings
 
 @imports_bp.route("/leads/preview", methods=["POST"])
 @requires_auth()
@@ -53,13 +179,17 @@ async def preview_leads():
 
     file = files['file']
     try:
-        df = read_file(file)
-        df.columns = df.columns.astype(str).str.strip()
+        # Only the preview rows are parsed; the total comes from a cheap estimate
+        headers, rows, total_rows = read_preview(file, PREVIEW_ROWS)
+        preview = [
+            ['' if (v := row.get(h)) is None else v for h in headers]
+            for row in rows
+        ]
 
-        return jsonify({
-            "headers": df.columns.tolist(),
-            "rows": df.head(10).fillna('').values.tolist(),
-            "totalRows": len(df)
+        return orjson_response({
+            "headers": headers,
+            "rows": preview,
+            "totalRows": total_rows
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 400
@@ -70,7 +200,6 @@ async def submit_leads():
     user = request.user
     form = await request.form
     files = await request.files
-    successful_leads = []
 
     if 'file' not in files:
         return jsonify({"error": "No file uploaded"}), 400
@@ -89,85 +218,51 @@ async def submit_leads():
         if not assigned_user:
             return jsonify({"error": "Assigned user not found or inactive"}), 400
 
-        df = read_file(file)
-        df.columns = df.columns.astype(str).str.strip()
+        _, rows = read_rows(file)
 
-        mapped_fields = [m['leadField'] for m in column_mappings if m['leadField']]
-        if 'name' not in mapped_fields:
+        # Resolve each mapping's cleaner once instead of re-dispatching per cell.
+        # Fields outside VALID_LEAD_FIELDS get no cleaner, so any row that fills
+        # them fails on its own instead of reaching the INSERT.
+        active_mappings = [
+            (
+                m['csvColumn'],
+                m['leadField'],
+                _make_cleaner(m['leadField']) if m['leadField'] in VALID_LEAD_FIELDS else None,
+            )
+            for m in column_mappings if m['leadField']
+        ]
+        if 'name' not in [lead_field for _, lead_field, _ in active_mappings]:
             return jsonify({"error": "'name' field (Company Name) is required"}), 400
 
-        successful = 0
-        failed = 0
-        failures = []
-        warnings = []
-
-        for idx, row in df.iterrows():
-            try:
-                lead_data = {}
-                for mapping in column_mappings:
-                    csv_col = mapping['csvColumn']
-                    lead_field = mapping['leadField']
-                    if not lead_field:  # Skip unmapped fields
-                        continue
-
-                    val = row.get(csv_col, '')
-                    if pd.isna(val) or str(val).strip() == '':
-                        continue
-
-                    cleaned = str(val).strip()
-                    # ... cleaning logic here ...
-                    lead_data[lead_field] = cleaned
-
-                    if lead_field in ['phone', 'secondary_phone']:
-                        cleaned = clean_phone_number(cleaned)
-                        if not cleaned:
-                            warnings.append(f"Invalid phone on row {idx + 2}")
-                            continue
-                    elif lead_field == 'email':
-                        cleaned = cleaned.lower()
-                    elif lead_field == 'type' and cleaned.lower() not in [t.lower() for t in TYPE_OPTIONS]:
-                        warnings.append(f"Unknown business type '{cleaned}' on row {idx + 2}")
-                        cleaned = "None"
-                    elif lead_field == 'lead_status' and cleaned.lower() not in [s.lower() for s in LEAD_STATUS_OPTIONS]:
-                        warnings.append(f"Unknown lead status '{cleaned}' on row {idx + 2}")
-                        cleaned = "open"
-                    elif lead_field.endswith("_label") and cleaned.lower() not in [p.lower() for p in PHONE_LABELS]:
-                        warnings.append(f"Unknown phone label '{cleaned}' on row {idx + 2}")
-                        cleaned = "work"
-
-                    lead_data[lead_field] = cleaned
-
-                if not lead_data.get("name"):
-                    raise ValueError("Missing required 'name' field")
-
-                lead_data.setdefault("type", "None")
-                lead_data.setdefault("lead_status", "open")
-                if "phone" in lead_data and "phone_label" not in lead_data:
-                    lead_data["phone_label"] = "work"
-                if "secondary_phone" in lead_data and "secondary_phone_label" not in lead_data:
-                    lead_data["secondary_phone_label"] = "mobile"
-
-                lead = Lead(
-                    tenant_id=user.tenant_id,
-                    created_by=user.id,
-                    assigned_to=assigned_user.id,
-                    created_at=datetime.utcnow(),
-                    **lead_data
-                )
-                successful_leads.append(lead_data.copy())
-                session.add(lead)
-                session.flush()
-                successful += 1
-            except Exception as e:
-                failed += 1
-                failures.append({
-                    "row": idx + 2,
-                    "data": row.dropna().to_dict(),
-                    "error": str(e)
-                })
-                session.rollback()
+        # Pass 1 is pure Python; pass 2 is a single INSERT of the valid rows
+        lead_defaults = {
+            "tenant_id": user.tenant_id,
+            "created_by": user.id,
+            "assigned_to": assigned_user.id,
+            "created_at": datetime.utcnow(),
+        }
+        # Validate in chunks on a worker thread so a large file doesn't block
+        # the event loop. The row iterator reads the file lazily, so chunks
+        # are pulled one after another rather than fanned out.
+        indexed_rows = enumerate(rows)
+        successful_leads, failures, warnings = [], [], set()
+        while True:
+            valid, chunk_failures, chunk_warnings = await asyncio.to_thread(
+                _validate_rows,
+                islice(indexed_rows, VALIDATION_CHUNK_SIZE),
+                active_mappings,
+                lead_defaults,
+            )
+            successful_leads.extend(valid)
+            failures.extend(chunk_failures)
+            warnings |= chunk_warnings
+            if len(valid) + len(chunk_failures) < VALIDATION_CHUNK_SIZE:
+                break
+        successful = len(successful_leads)
+        failed = len(failures)
 
         if successful:
+            session.execute(insert(Lead), successful_leads)
             session.commit()
 
         if successful:
@@ -193,27 +288,31 @@ async def submit_leads():
             "message": f"Import complete: {successful} succeeded, {failed} failed.",
             "successful_imports": successful,
             "failed_imports": failed,
-            "warnings": list(set(warnings)),
+            "warnings": list(warnings),
             "failures": failures
         })
     except Exception as e:
         session.rollback()
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
-    finally:
-        session.close()
 
 
+# The template never changes, so build it (and its ETag) once at import time
+_LEAD_TEMPLATE_CSV = (",".join([
+    "Company Name", "Contact Person", "Contact Title", "Email", "Phone",
+    "Phone Label", "Secondary Phone", "Secondary Phone Label", "Address",
+    "City", "State", "Zip", "Notes", "Type", "Lead Status"
+]) + "\n").encode()
+_LEAD_TEMPLATE_ETAG = make_etag(hashlib.sha1(_LEAD_TEMPLATE_CSV).hexdigest())
+_LEAD_TEMPLATE_CACHE_CONTROL = "private, max-age=3600"
+
 @imports_bp.route("/leads/template", methods=["GET"])
 @requires_auth()
 async def get_lead_template():
-    headers = [
-        "Company Name", "Contact Person", "Contact Title", "Email", "Phone",
-        "Phone Label", "Secondary Phone", "Secondary Phone Label", "Address",
-        "City", "State", "Zip", "Notes", "Type", "Lead Status"
-    ]
-    csv_data = ",".join(headers) + "\n"
-    return Response(
-        csv_data,
+    if (cached := not_modified(_LEAD_TEMPLATE_ETAG, _LEAD_TEMPLATE_CACHE_CONTROL)) is not None:
+        return cached
+    response = Response(
+        _LEAD_TEMPLATE_CSV,
         mimetype="text/csv",
         headers={"Content-Disposition": "attachment;filename=lead_import_template.csv"}
     )
+    return set_etag(response, _LEAD_TEMPLATE_ETAG, _LEAD_TEMPLATE_CACHE_CONTROL)
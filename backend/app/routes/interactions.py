@@ -1,187 +1,202 @@
 from quart import Blueprint, request, jsonify, Response
 from datetime import datetime
 from sqlalchemy.orm import joinedload
-from sqlalchemy import or_, and_, func
+from sqlalchemy import String, or_, and_, func, case, cast, select, true
 from icalendar import Calendar, Event
 
 from app.models import Interaction, Client, Lead, Project, FollowUpStatus, User, ActivityLog, ActivityType
 from app.database import SessionLocal
 from app.utils.auth_utils import requires_auth
+from app.utils.orjson_response import orjson_response
 
 interactions_bp = Blueprint("interactions", __name__, url_prefix="/api/interactions")
 
 
+def _first_set(*columns):
+    """SQL equivalent of `a or b or c` for nullable string columns."""
+    return func.coalesce(*(func.nullif(c, "") for c in columns))
+
+
+def _user_can_edit(user):
+    """
+    Filter matching interactions whose client, lead or project (checked in that
+    order) belongs to the user.
+    """
+    owned_clients = select(Client.id).where(
+        or_(Client.created_by == user.id, Client.assigned_to == user.id)
+    )
+    owned_leads = select(Lead.id).where(
+        or_(Lead.created_by == user.id, Lead.assigned_to == user.id)
+    )
+    owned_projects = select(Project.id).where(Project.created_by == user.id)
+    return or_(
+        Interaction.client_id.in_(owned_clients),
+        and_(Interaction.client_id == None, Interaction.lead_id.in_(owned_leads)),
+        and_(
+            Interaction.client_id == None,
+            Interaction.lead_id == None,
+            Interaction.project_id.in_(owned_projects)
+        )
+    )
+
+
 @interactions_bp.route("/", methods=["GET"])
 @requires_auth()
 async def list_interactions():
     user = request.user
     session = SessionLocal()
-    try:
-        client_id = request.args.get("client_id")
-        lead_id = request.args.get("lead_id")
-        project_id = request.args.get("project_id")  # NEW: Add project support
-        page = int(request.args.get("page", 1))
-        per_page = int(request.args.get("per_page", 10))
-        sort_order = request.args.get("sort", "newest")
-
-        # Validate only one entity type is specified
-        entity_count = sum(bool(x) for x in [client_id, lead_id, project_id])
-        if entity_count > 1:
-            return jsonify({"error": "Cannot filter by multiple entity types"}), 400
-
-        # Validate sort order
-        valid_sorts = ["newest", "oldest", "pending", "completed"]
-        if sort_order not in valid_sorts:
-            sort_order = "newest"
-
-        query = session.query(Interaction).options(
-            joinedload(Interaction.client),
-            joinedload(Interaction.lead),
-            joinedload(Interaction.project)  # NEW: Add project loading
-        ).filter(Interaction.tenant_id == user.tenant_id)
-
-        # Apply entity-based access control
-        if not any(role.name == "admin" for role in user.roles):
-            query = query.filter(
-                or_(
-                    # Client interactions - user has access to client
-                    and_(
-                        Interaction.client_id != None,
-                        Interaction.client.has(
-                            or_(
-                                Client.created_by == user.id,
-                                Client.assigned_to == user.id
-                            )
-                        )
-                    ),
-                    # Lead interactions - user has access to lead
-                    and_(
-                        Interaction.lead_id != None,
-                        Interaction.lead.has(
-                            or_(
-                                Lead.created_by == user.id,
-                                Lead.assigned_to == user.id
-                            )
-                        )
-                    ),
-                    # Project interactions - user created the project
-                    and_(
-                        Interaction.project_id != None,
-                        Interaction.project.has(Project.created_by == user.id)
+    client_id = request.args.get("client_id")
+    lead_id = request.args.get("lead_id")
+    project_id = request.args.get("project_id")  # NEW: Add project support
+    page = int(request.args.get("page", 1))
+    per_page = int(request.args.get("per_page", 10))
+    sort_order = request.args.get("sort", "newest")
+
+    # Validate only one entity type is specified
+    entity_count = sum(bool(x) for x in [client_id, lead_id, project_id])
+    if entity_count > 1:
+        return jsonify({"error": "Cannot filter by multiple entity types"}), 400
+
+    # Validate sort order
+    valid_sorts = ["newest", "oldest", "pending", "completed"]
+    if sort_order not in valid_sorts:
+        sort_order = "newest"
+
+    # Select only the columns the response needs; contact fields fall back
+    # from the interaction to its client/lead/project in SQL.
+    stmt = select(
+        Interaction.id,
+        Interaction.contact_date,
+        Interaction.follow_up,
+        Interaction.summary,
+        Interaction.outcome,
+        Interaction.notes,
+        Interaction.client_id,
+        Interaction.lead_id,
+        Interaction.project_id,
+        Client.name.label("client_name"),
+        Lead.name.label("lead_name"),
+        Project.project_name.label("project_name"),
+        _first_set(
+            Interaction.contact_person, Client.contact_person,
+            Lead.contact_person, Project.primary_contact_name
+        ).label("contact_person"),
+        _first_set(
+            Interaction.email, Client.email,
+            Lead.email, Project.primary_contact_email
+        ).label("email"),
+        _first_set(
+            Interaction.phone, Client.phone,
+            Lead.phone, Project.primary_contact_phone
+        ).label("phone"),
+        func.coalesce(
+            _first_set(Client.phone_label, Lead.phone_label, Project.primary_contact_phone_label),
+            "work"
+        ).label("phone_label"),
+        # NOTE: Projects only have primary contact for now
+        _first_set(Client.secondary_phone, Lead.secondary_phone).label("secondary_phone"),
+        _first_set(Client.secondary_phone_label, Lead.secondary_phone_label).label("secondary_phone_label"),
+        Interaction.followup_status,
+        case(
+            (Interaction.client_id != None, "/clients/" + cast(Interaction.client_id, String)),
+            (Interaction.lead_id != None, "/leads/" + cast(Interaction.lead_id, String)),
+            (Interaction.project_id != None, "/projects/" + cast(Interaction.project_id, String)),
+            else_=None
+        ).label("profile_link"),
+    ).select_from(Interaction)\
+     .outerjoin(Client, Interaction.client_id == Client.id)\
+     .outerjoin(Lead, Interaction.lead_id == Lead.id)\
+     .outerjoin(Project, Interaction.project_id == Project.id)\
+     .where(Interaction.tenant_id == user.tenant_id)
+
+    # Apply entity-based access control
+    if not any(role.name == "admin" for role in user.roles):
+        stmt = stmt.where(
+            or_(
+                # Client interactions - user has access to client
+                and_(
+                    Interaction.client_id != None,
+                    or_(
+                        Client.created_by == user.id,
+                        Client.assigned_to == user.id
+                    )
+                ),
+                # Lead interactions - user has access to lead
+                and_(
+                    Interaction.lead_id != None,
+                    or_(
+                        Lead.created_by == user.id,
+                        Lead.assigned_to == user.id
                     )
+                ),
+                # Project interactions - user created the project
+                and_(
+                    Interaction.project_id != None,
+                    Project.created_by == user.id
                 )
             )
+        )
 
-        # Apply entity-specific filters
-        if client_id:
-            query = query.filter(
-                Interaction.client_id == int(client_id),
-                Interaction.lead_id == None,
-                Interaction.project_id == None
-            )
-        elif lead_id:
-            query = query.filter(
-                Interaction.lead_id == int(lead_id),
-                Interaction.client_id == None,
-                Interaction.project_id == None
-            )
-        elif project_id:  # NEW: Project filtering
-            query = query.filter(
-                Interaction.project_id == int(project_id),
-                Interaction.client_id == None,
-                Interaction.lead_id == None
-            )
+    # Apply entity-specific filters
+    if client_id:
+        stmt = stmt.where(
+            Interaction.client_id == int(client_id),
+            Interaction.lead_id == None,
+            Interaction.project_id == None
+        )
+    elif lead_id:
+        stmt = stmt.where(
+            Interaction.lead_id == int(lead_id),
+            Interaction.client_id == None,
+            Interaction.project_id == None
+        )
+    elif project_id:  # NEW: Project filtering
+        stmt = stmt.where(
+            Interaction.project_id == int(project_id),
+            Interaction.client_id == None,
+            Interaction.lead_id == None
+        )
 
-        # Apply sorting
-        if sort_order == "newest":
-            query = query.order_by(Interaction.contact_date.desc())
-        elif sort_order == "oldest":
-            query = query.order_by(Interaction.contact_date.asc())
-        elif sort_order == "pending":
-            query = query.order_by(
-                (and_(
-                    Interaction.follow_up != None,
-                    Interaction.followup_status != FollowUpStatus.completed
-                )).desc(),
-                Interaction.follow_up.asc(),
-                Interaction.contact_date.desc()
-            )
-        elif sort_order == "completed":
-            query = query.order_by(
-                (Interaction.followup_status == FollowUpStatus.completed).desc(),
-                Interaction.contact_date.desc()
-            )
+    total = session.execute(
+        stmt.with_only_columns(func.count(Interaction.id))
+    ).scalar()
+
+    # Apply sorting
+    if sort_order == "newest":
+        stmt = stmt.order_by(Interaction.contact_date.desc())
+    elif sort_order == "oldest":
+        stmt = stmt.order_by(Interaction.contact_date.asc())
+    elif sort_order == "pending":
+        stmt = stmt.order_by(
+            (and_(
+                Interaction.follow_up != None,
+                Interaction.followup_status != FollowUpStatus.completed
+            )).desc(),
+            Interaction.follow_up.asc(),
+            Interaction.contact_date.desc()
+        )
+    elif sort_order == "completed":
+        stmt = stmt.order_by(
+            (Interaction.followup_status == FollowUpStatus.completed).desc(),
+            Interaction.contact_date.desc()
+        )
 
-        total = query.count()
-        interactions = query.offset((page - 1) * per_page).limit(per_page).all()
-
-        response_data = {
-            "interactions": [
-                {
-                    "id": i.id,
-                    "contact_date": i.contact_date.isoformat(),
-                    "follow_up": i.follow_up.isoformat() if i.follow_up else None,
-                    "summary": i.summary,
-                    "outcome": i.outcome,
-                    "notes": i.notes,
-                    "client_id": i.client_id,
-                    "lead_id": i.lead_id,
-                    "project_id": i.project_id,  # NEW: Include project_id
-                    "client_name": i.client.name if i.client else None,
-                    "lead_name": i.lead.name if i.lead else None,
-                    "project_name": i.project.project_name if i.project else None,  # NEW: Project name
-                    "contact_person": (
-                        i.contact_person or  # Use interaction's contact if set
-                        (i.client.contact_person if i.client else None) or
-                        (i.lead.contact_person if i.lead else None) or
-                        (i.project.primary_contact_name if i.project else None)  # NEW: Project contact
-                    ),
-                    "email": (
-                        i.email or  # Use interaction's email if set
-                        (i.client.email if i.client else None) or
-                        (i.lead.email if i.lead else None) or
-                        (i.project.primary_contact_email if i.project else None)  # NEW: Project email
-                    ),
-                    "phone": (
-                        i.phone or  # Use interaction's phone if set
-                        (i.client.phone if i.client else None) or
-                        (i.lead.phone if i.lead else None) or
-                        (i.project.primary_contact_phone if i.project else None)  # NEW: Project phone
-                    ),
-                    "phone_label": (
-                        (i.client.phone_label if i.client else None) or
-                        (i.lead.phone_label if i.lead else None) or
-                        (i.project.primary_contact_phone_label if i.project else None) or
-                        "work"
-                    ),
-                    "secondary_phone": (
-                        (i.client.secondary_phone if i.client else None) or
-                        (i.lead.secondary_phone if i.lead else None)
-                        # NOTE: Projects only have primary contact for now
-                    ),
-                    "secondary_phone_label": (
-                        (i.client.secondary_phone_label if i.client else None) or
-                        (i.lead.secondary_phone_label if i.lead else None)
-                    ),
-                    "followup_status": i.followup_status.value if i.followup_status else None,
-                    "profile_link": (
-                        f"/clients/{i.client_id}" if i.client_id else
-                        f"/leads/{i.lead_id}" if i.lead_id else
-                        f"/projects/{i.project_id}" if i.project_id else None  # NEW: Project link
-                    )
-                } for i in interactions
-            ],
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "sort_order": sort_order
-        }
+    rows = session.execute(
+        stmt.offset((page - 1) * per_page).limit(per_page)
+    ).mappings()
 
-        response = jsonify(response_data)
-        response.headers["Cache-Control"] = "no-store"
-        return response
-    finally:
-        session.close()
+    response_data = {
+        "interactions": [dict(row) for row in rows],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "sort_order": sort_order
+    }
+
+    # contact_date/follow_up are stored as local wall-clock times, no "Z"
+    response = orjson_response(response_data, naive_utc=False)
+    response.headers["Cache-Control"] = "no-store"
+    return response
 
 
 @interactions_bp.route("/", methods=["POST"])
@@ -190,71 +205,69 @@ async def create_interaction():
     data = await request.get_json()
     user = request.user
     session = SessionLocal()
-    try:
-        # Validate exactly one entity is specified
-        entity_ids = [data.get("client_id"), data.get("lead_id"), data.get("project_id")]
-        entity_count = sum(bool(x) for x in entity_ids)
-        
-        if entity_count != 1:
-            return jsonify({"error": "Interaction must link to exactly one entity (client, lead, or project)"}), 400
-
-        # Validate user has access to the entity
-        if data.get("client_id"):
-            entity = session.query(Client).filter(
-                Client.id == int(data["client_id"]),
-                Client.tenant_id == user.tenant_id,
-                Client.deleted_at == None
-            ).first()
-            if not entity:
-                return jsonify({"error": "Client not found"}), 404
-            if not any(role.name == "admin" for role in user.roles):
-                if entity.created_by != user.id and entity.assigned_to != user.id:
-                    return jsonify({"error": "Access denied to this client"}), 403
-                    
-        elif data.get("lead_id"):
-            entity = session.query(Lead).filter(
-                Lead.id == int(data["lead_id"]),
-                Lead.tenant_id == user.tenant_id,
-                Lead.deleted_at == None
-            ).first()
-            if not entity:
-                return jsonify({"error": "Lead not found"}), 404
-            if not any(role.name == "admin" for role in user.roles):
-                if entity.created_by != user.id and entity.assigned_to != user.id:
-                    return jsonify({"error": "Access denied to this lead"}), 403
-                    
-        elif data.get("project_id"):  # NEW: Project validation
-            entity = session.query(Project).filter(
-                Project.id == int(data["project_id"]),
-                Project.tenant_id == user.tenant_id
-            ).first()
-            if not entity:
-                return jsonify({"error": "Project not found"}), 404
-            if not any(role.name == "admin" for role in user.roles):
-                if entity.created_by != user.id:
-                    return jsonify({"error": "Access denied to this project"}), 403
-
-        interaction = Interaction(
-            tenant_id=user.tenant_id,
-            client_id=int(data["client_id"]) if data.get("client_id") else None,
-            lead_id=int(data["lead_id"]) if data.get("lead_id") else None,
-            project_id=int(data["project_id"]) if data.get("project_id") else None,  # NEW: Project support
-            contact_date=datetime.fromisoformat(data["contact_date"]),
-            summary=data["summary"],
-            outcome=data.get("outcome"),
-            notes=data.get("notes"),
-            follow_up=datetime.fromisoformat(data["follow_up"]) if data.get("follow_up") else None,
-            contact_person=data.get("contact_person"),
-            email=data.get("email"),
-            phone=data.get("phone")
-        )
-        session.add(interaction)
-        session.commit()
-        session.refresh(interaction)
-
-        return jsonify({"id": interaction.id}), 201
-    finally:
-        session.close()
+    # Validate exactly one entity is specified
+    entity_ids = [data.get("client_id"), data.get("lead_id"), data.get("project_id")]
+    entity_count = sum(bool(x) for x in entity_ids)
+    
+    if entity_count != 1:
+        return jsonify({"error": "Interaction must link to exactly one entity (client, lead, or project)"}), 400
+
+    # Validate user has access to the entity
+    if data.get("client_id"):
+        entity = session.query(Client).filter(
+            Client.id == int(data["client_id"]),
+            Client.tenant_id == user.tenant_id,
+            Client.deleted_at == None
+        ).first()
+        if not entity:
+            return jsonify({"error": "Client not found"}), 404
+        if not any(role.name == "admin" for role in user.roles):
+            if entity.created_by != user.id and entity.assigned_to != user.id:
+                return jsonify({"error": "Access denied to this client"}), 403
+                
+    elif data.get("lead_id"):
+        entity = session.query(Lead).filter(
+            Lead.id == int(data["lead_id"]),
+            Lead.tenant_id == user.tenant_id,
+            Lead.deleted_at == None
+        ).first()
+        if not entity:
+            return jsonify({"error": "Lead not found"}), 404
+        if not any(role.name == "admin" for role in user.roles):
+            if entity.created_by != user.id and entity.assigned_to != user.id:
+                return jsonify({"error": "Access denied to this lead"}), 403
+                
+    elif data.get("project_id"):  # NEW: Project validation
+        entity = session.query(Project).filter(
+            Project.id == int(data["project_id"]),
+            Project.tenant_id == user.tenant_id
+        ).first()
+        if not entity:
+            return jsonify({"error": "Project not found"}), 404
+        if not any(role.name == "admin" for role in user.roles):
+            if entity.created_by != user.id:
+                return jsonify({"error": "Access denied to this project"}), 403
+
+    interaction = Interaction(
+        tenant_id=user.tenant_id,
+        client_id=int(data["client_id"]) if data.get("client_id") else None,
+        lead_id=int(data["lead_id"]) if data.get("lead_id") else None,
+        project_id=int(data["project_id"]) if data.get("project_id") else None,  # NEW: Project support
+        contact_date=datetime.fromisoformat(data["contact_date"]),
+        summary=data["summary"],
+        outcome=data.get("outcome"),
+        notes=data.get("notes"),
+        follow_up=datetime.fromisoformat(data["follow_up"]) if data.get("follow_up") else None,
+        contact_person=data.get("contact_person"),
+        email=data.get("email"),
+        phone=data.get("phone")
+    )
+    session.add(interaction)
+    session.flush()
+    new_id = interaction.id  # read before commit expires the instance
+    session.commit()
+
+    return jsonify({"id": new_id}), 201
 
 
 @interactions_bp.route("/<int:interaction_id>", methods=["PUT"])
@@ -263,47 +276,37 @@ async def update_interaction(interaction_id):
     data = await request.get_json()
     user = request.user
     session = SessionLocal()
-    try:
-        interaction = session.query(Interaction).options(
-            joinedload(Interaction.client),
-            joinedload(Interaction.lead),
-            joinedload(Interaction.project)  # NEW: Load project
-        ).filter(
-            Interaction.id == interaction_id,
-            Interaction.tenant_id == user.tenant_id
-        ).first()
-
-        if not interaction:
-            return jsonify({"error": "Interaction not found"}), 404
-
-        # Validate user has access to the associated entity
-        if not any(role.name == "admin" for role in user.roles):
-            has_access = False
-            if interaction.client_id:
-                has_access = interaction.client.created_by == user.id or interaction.client.assigned_to == user.id
-            elif interaction.lead_id:
-                has_access = interaction.lead.created_by == user.id or interaction.lead.assigned_to == user.id
-            elif interaction.project_id:  # NEW: Project access check
-                has_access = interaction.project.created_by == user.id
-                
-            if not has_access:
-                return jsonify({"error": "Access denied"}), 403
-
-        for field in [
-            "contact_date", "summary", "outcome",
-            "notes", "follow_up", "contact_person", "email", "phone"
-        ]:
-            if field in data:
-                if field in ["contact_date", "follow_up"]:
-                    setattr(interaction, field, datetime.fromisoformat(data[field]) if data[field] else None)
-                else:
-                    setattr(interaction, field, data[field] or None)
-
-        session.commit()
-        session.refresh(interaction)
-        return jsonify({"id": interaction.id})
-    finally:
-        session.close()
+    is_admin = any(role.name == "admin" for role in user.roles)
+
+    # Existence and access in one query, before any of the payload is parsed
+    access = session.query(
+        Interaction.id,
+        (true() if is_admin else _user_can_edit(user)).label("can_edit"),
+    ).filter(
+        Interaction.id == interaction_id,
+        Interaction.tenant_id == user.tenant_id
+    ).first()
+    if not access:
+        return jsonify({"error": "Interaction not found"}), 404
+    if not access.can_edit:
+        return jsonify({"error": "Access denied"}), 403
+
+    values = {}
+    for field in [
+        "contact_date", "summary", "outcome",
+        "notes", "follow_up", "contact_person", "email", "phone"
+    ]:
+        if field in data:
+            if field in ["contact_date", "follow_up"]:
+                values[field] = datetime.fromisoformat(data[field]) if data[field] else None
+            else:
+                values[field] = data[field] or None
+
+    if values:
+        session.query(Interaction).filter(Interaction.id == interaction_id)\
+            .update(values, synchronize_session=False)
+    session.commit()
+    return jsonify({"id": interaction_id})
 
 
 @interactions_bp.route("/<int:interaction_id>", methods=["DELETE"])
@@ -311,37 +314,34 @@ async def update_interaction(interaction_id):
 async def delete_interaction(interaction_id):
     user = request.user
     session = SessionLocal()
-    try:
-        interaction = session.query(Interaction).options(
-            joinedload(Interaction.client),
-            joinedload(Interaction.lead),
-            joinedload(Interaction.project)  # NEW: Load project
-        ).filter(
-            Interaction.id == interaction_id,
-            Interaction.tenant_id == user.tenant_id
-        ).first()
-
-        if not interaction:
-            return jsonify({"error": "Interaction not found"}), 404
-
-        # Validate user has access to delete
-        if not any(role.name == "admin" for role in user.roles):
-            has_access = False
-            if interaction.client_id:
-                has_access = interaction.client.created_by == user.id or interaction.client.assigned_to == user.id
-            elif interaction.lead_id:
-                has_access = interaction.lead.created_by == user.id or interaction.lead.assigned_to == user.id
-            elif interaction.project_id:  # NEW: Project access check
-                has_access = interaction.project.created_by == user.id
-                
-            if not has_access:
-                return jsonify({"error": "Access denied"}), 403
+    interaction = session.query(Interaction).options(
+        joinedload(Interaction.client),
+        joinedload(Interaction.lead),
+        joinedload(Interaction.project)  # NEW: Load project
+    ).filter(
+        Interaction.id == interaction_id,
+        Interaction.tenant_id == user.tenant_id
+    ).first()
+
+    if not interaction:
+        return jsonify({"error": "Interaction not found"}), 404
+
+    # Validate user has access to delete
+    if not any(role.name == "admin" for role in user.roles):
+        has_access = False
+        if interaction.client_id:
+            has_access = interaction.client.created_by == user.id or interaction.client.assigned_to == user.id
+        elif interaction.lead_id:
+            has_access = interaction.lead.created_by == user.id or interaction.lead.assigned_to == user.id
+        elif interaction.project_id:  # NEW: Project access check
+            has_access = interaction.project.created_by == user.id
+            
+        if not has_access:
+            return jsonify({"error": "Access denied"}), 403
 
-        session.delete(interaction)
-        session.commit()
-        return jsonify({"message": "Interaction deleted"})
-    finally:
-        session.close()
+    session.delete(interaction)
+    session.commit()
+    return jsonify({"message": "Interaction deleted"})
 
 
 @interactions_bp.route("/transfer", methods=["POST"])
@@ -356,102 +356,94 @@ async def transfer_interactions():
         return jsonify({"error": "Missing from_lead_id or to_client_id"}), 400
 
     session = SessionLocal()
-    try:
-        interactions = session.query(Interaction).filter(
-            Interaction.tenant_id == user.tenant_id,
-            Interaction.lead_id == from_lead_id
-        ).all()
-
-        for interaction in interactions:
-            interaction.lead_id = None
-            interaction.client_id = to_client_id
-
-        session.commit()
+    transferred = session.query(Interaction).filter(
+        Interaction.tenant_id == user.tenant_id,
+        Interaction.lead_id == from_lead_id
+    ).update(
+        {Interaction.lead_id: None, Interaction.client_id: to_client_id},
+        synchronize_session=False
+    )
+    session.commit()
 
-        return jsonify({
-            "success": True,
-            "transferred": len(interactions)
-        })
-    finally:
-        session.close()
+    return jsonify({
+        "success": True,
+        "transferred": transferred
+    })
 
 
 @interactions_bp.route("/<int:interaction_id>/calendar.ics", methods=["GET"])
 async def get_interaction_ics(interaction_id):
     session = SessionLocal()
-    try:
-        interaction = session.query(Interaction).options(
-            joinedload(Interaction.client),
-            joinedload(Interaction.lead),
-            joinedload(Interaction.project)  # NEW: Load project
-        ).filter(
-            Interaction.id == interaction_id
-        ).first()
-
-        if not interaction:
-            return Response("Interaction not found", status=404)
-
-        if not interaction.follow_up:
-            return Response("This interaction has no follow-up date", status=400)
-
-        cal = Calendar()
-        cal.add("prodid", "-//PathSix CRM//EN")
-        cal.add("version", "2.0")
-
-        # Determine entity name for calendar event
-        entity_name = (
-            interaction.client.name if interaction.client else
-            interaction.lead.name if interaction.lead else
-            interaction.project.project_name if interaction.project else  # NEW: Project name
-            "CRM Entity"
-        )
+    interaction = session.query(Interaction).options(
+        joinedload(Interaction.client),
+        joinedload(Interaction.lead),
+        joinedload(Interaction.project)  # NEW: Load project
+    ).filter(
+        Interaction.id == interaction_id
+    ).first()
+
+    if not interaction:
+        return Response("Interaction not found", status=404)
+
+    if not interaction.follow_up:
+        return Response("This interaction has no follow-up date", status=400)
+
+    cal = Calendar()
+    cal.add("prodid", "-//PathSix CRM//EN")
+    cal.add("version", "2.0")
+
+    # Determine entity name for calendar event
+    entity_name = (
+        interaction.client.name if interaction.client else
+        interaction.lead.name if interaction.lead else
+        interaction.project.project_name if interaction.project else  # NEW: Project name
+        "CRM Entity"
+    )
+
+    contact_name = (
+        interaction.contact_person or
+        (interaction.client.contact_person if interaction.client else None) or
+        (interaction.lead.contact_person if interaction.lead else None) or
+        (interaction.project.primary_contact_name if interaction.project else None) or  # NEW: Project contact
+        "Contact"
+    )
+
+    event = Event()
+    event.add("summary", f"Follow-up: {entity_name} - {contact_name}")
+    event.add("dtstart", interaction.follow_up)
+    event.add("dtend", interaction.follow_up)
+    event.add("dtstamp", interaction.contact_date)
+    event.add("description", f"Outcome: {interaction.outcome or ''}\nNotes: {interaction.notes or ''}")
+    
+    # Build location string with contact info
+    location_parts = []
+    if interaction.phone or (interaction.client and interaction.client.phone) or (interaction.lead and interaction.lead.phone) or (interaction.project and interaction.project.primary_contact_phone):
+        phone = (interaction.phone or 
+                (interaction.client.phone if interaction.client else None) or
+                (interaction.lead.phone if interaction.lead else None) or
+                (interaction.project.primary_contact_phone if interaction.project else None))
+        location_parts.append(f"Phone: {phone}")
+        
+    if interaction.email or (interaction.client and interaction.client.email) or (interaction.lead and interaction.lead.email) or (interaction.project and interaction.project.primary_contact_email):
+        email = (interaction.email or 
+                (interaction.client.email if interaction.client else None) or
+                (interaction.lead.email if interaction.lead else None) or
+                (interaction.project.primary_contact_email if interaction.project else None))
+        location_parts.append(f"Email: {email}")
+        
+    event.add("location", "\n".join(location_parts))
+    event["uid"] = f"interaction-{interaction.id}@pathsixcrm"
 
-        contact_name = (
-            interaction.contact_person or
-            (interaction.client.contact_person if interaction.client else None) or
-            (interaction.lead.contact_person if interaction.lead else None) or
-            (interaction.project.primary_contact_name if interaction.project else None) or  # NEW: Project contact
-            "Contact"
-        )
+    cal.add_component(event)
+    ics_content = cal.to_ical()
 
-        event = Event()
-        event.add("summary", f"Follow-up: {entity_name} - {contact_name}")
-        event.add("dtstart", interaction.follow_up)
-        event.add("dtend", interaction.follow_up)
-        event.add("dtstamp", interaction.contact_date)
-        event.add("description", f"Outcome: {interaction.outcome or ''}\nNotes: {interaction.notes or ''}")
-        
-        # Build location string with contact info
-        location_parts = []
-        if interaction.phone or (interaction.client and interaction.client.phone) or (interaction.lead and interaction.lead.phone) or (interaction.project and interaction.project.primary_contact_phone):
-            phone = (interaction.phone or 
-                    (interaction.client.phone if interaction.client else None) or
-                    (interaction.lead.phone if interaction.lead else None) or
-                    (interaction.project.primary_contact_phone if interaction.project else None))
-            location_parts.append(f"Phone: {phone}")
-            
-        if interaction.email or (interaction.client and interaction.client.email) or (interaction.lead and interaction.lead.email) or (interaction.project and interaction.project.primary_contact_email):
-            email = (interaction.email or 
-                    (interaction.client.email if interaction.client else None) or
-                    (interaction.lead.email if interaction.lead else None) or
-                    (interaction.project.primary_contact_email if interaction.project else None))
-            location_parts.append(f"Email: {email}")
-            
-        event.add("location", "\n".join(location_parts))
-        event["uid"] = f"interaction-{interaction.id}@pathsixcrm"
-
-        cal.add_component(event)
-        ics_content = cal.to_ical()
-
-        return Response(
-            ics_content,
-            content_type="text/calendar",
-            headers={
-                "Content-Disposition": f"attachment; filename=interaction-{interaction.id}.ics"
-            }
-        )
-    finally:
-        session.close()
+    return Response(
+        ics_content,
+        content_type="text/calendar",
+        headers={
+            "Content-Disposition": f"attachment; filename=interaction-{interaction.id}.ics"
+        }
+    )
 
 
 @interactions_bp.route("/<int:interaction_id>/complete", methods=["PUT"])
@@ -459,37 +451,34 @@ async def get_interaction_ics(interaction_id):
 async def complete_interaction(interaction_id):
     user = request.user
     session = SessionLocal()
-    try:
-        interaction = session.query(Interaction).options(
-            joinedload(Interaction.client),
-            joinedload(Interaction.lead),
-            joinedload(Interaction.project)  # NEW: Load project
-        ).filter(
-            Interaction.id == interaction_id,
-            Interaction.tenant_id == user.tenant_id
-        ).first()
-
-        if not interaction:
-            return jsonify({"error": "Interaction not found"}), 404
-
-        # Validate user has access
-        if not any(role.name == "admin" for role in user.roles):
-            has_access = False
-            if interaction.client_id:
-                has_access = interaction.client.created_by == user.id or interaction.client.assigned_to == user.id
-            elif interaction.lead_id:
-                has_access = interaction.lead.created_by == user.id or interaction.lead.assigned_to == user.id
-            elif interaction.project_id:  # NEW: Project access check
-                has_access = interaction.project.created_by == user.id
-                
-            if not has_access:
-                return jsonify({"error": "Access denied"}), 403
+    interaction = session.query(Interaction).options(
+        joinedload(Interaction.client),
+        joinedload(Interaction.lead),
+        joinedload(Interaction.project)  # NEW: Load project
+    ).filter(
+        Interaction.id == interaction_id,
+        Interaction.tenant_id == user.tenant_id
+    ).first()
+
+    if not interaction:
+        return jsonify({"error": "Interaction not found"}), 404
+
+    # Validate user has access
+    if not any(role.name == "admin" for role in user.roles):
+        has_access = False
+        if interaction.client_id:
+            has_access = interaction.client.created_by == user.id or interaction.client.assigned_to == user.id
+        elif interaction.lead_id:
+            has_access = interaction.lead.created_by == user.id or interaction.lead.assigned_to == user.id
+        elif interaction.project_id:  # NEW: Project access check
+            has_access = interaction.project.created_by == user.id
+            
+        if not has_access:
+            return jsonify({"error": "Access denied"}), 403
 
-        interaction.followup_status = FollowUpStatus.completed
-        session.commit()
-        return jsonify({"message": "Interaction marked as completed"})
-    finally:
-        session.close()
+    interaction.followup_status = FollowUpStatus.completed
+    session.commit()
+    return jsonify({"message": "Interaction marked as completed"})
 
 
 @interactions_bp.route("/all", methods=["GET"])
@@ -497,127 +486,124 @@ async def complete_interaction(interaction_id):
 async def list_all_interactions_admin():
     user = request.user
     session = SessionLocal()
-    try:
-        page = int(request.args.get("page", 1))
-        per_page = int(request.args.get("per_page", 20))
-        sort_order = request.args.get("sort", "newest")
-        user_email = request.args.get("user_email")
-        
-        if sort_order not in ["newest", "oldest", "alphabetical"]:
-            sort_order = "newest"
-
-        query = session.query(Interaction).options(
-            joinedload(Interaction.client).joinedload(Client.assigned_user),
-            joinedload(Interaction.client).joinedload(Client.created_by_user),
-            joinedload(Interaction.lead).joinedload(Lead.assigned_user),
-            joinedload(Interaction.lead).joinedload(Lead.created_by_user),
-            joinedload(Interaction.project)  # NEW: Add project loading
-        ).filter(
-            Interaction.tenant_id == user.tenant_id
-        )
-
-        # Filter by user if specified
-        if user_email:
-            query = query.filter(
-                or_(
-                    # Client interactions
-                    and_(
-                        Interaction.client_id != None,
-                        or_(
-                            Interaction.client.has(Client.assigned_user.has(User.email == user_email)),
-                            Interaction.client.has(Client.created_by_user.has(User.email == user_email))
-                        )
-                    ),
-                    # Lead interactions
-                    and_(
-                        Interaction.lead_id != None,
-                        or_(
-                            Interaction.lead.has(Lead.assigned_user.has(User.email == user_email)),
-                            Interaction.lead.has(Lead.created_by_user.has(User.email == user_email))
-                        )
-                    ),
-                    # Project interactions - NEW: Add project filtering
-                    and_(
-                        Interaction.project_id != None,
-                        Interaction.project.has(Project.created_by == 
-                            session.query(User.id).filter(User.email == user_email).scalar_subquery()
-                        )
+    page = int(request.args.get("page", 1))
+    per_page = int(request.args.get("per_page", 20))
+    sort_order = request.args.get("sort", "newest")
+    user_email = request.args.get("user_email")
+    
+    if sort_order not in ["newest", "oldest", "alphabetical"]:
+        sort_order = "newest"
+
+    query = session.query(Interaction).options(
+        joinedload(Interaction.client).joinedload(Client.assigned_user),
+        joinedload(Interaction.client).joinedload(Client.created_by_user),
+        joinedload(Interaction.lead).joinedload(Lead.assigned_user),
+        joinedload(Interaction.lead).joinedload(Lead.created_by_user),
+        joinedload(Interaction.project)  # NEW: Add project loading
+    ).filter(
+        Interaction.tenant_id == user.tenant_id
+    )
+
+    # Filter by user if specified
+    if user_email:
+        query = query.filter(
+            or_(
+                # Client interactions
+                and_(
+                    Interaction.client_id != None,
+                    or_(
+                        Interaction.client.has(Client.assigned_user.has(User.email == user_email)),
+                        Interaction.client.has(Client.created_by_user.has(User.email == user_email))
                     )
-                )
-            )
-
-        # Apply sorting
-        if sort_order == "newest":
-            query = query.order_by(Interaction.contact_date.desc())
-        elif sort_order == "oldest":
-            query = query.order_by(Interaction.contact_date.asc())
-        elif sort_order == "alphabetical":
-            # Sort by entity name alphabetically
-            query = query.order_by(
-                func.coalesce(Client.name, Lead.name, Project.project_name).asc()  # NEW: Include project name
-            ).outerjoin(Client, Interaction.client_id == Client.id)\
-             .outerjoin(Lead, Interaction.lead_id == Lead.id)\
-             .outerjoin(Project, Interaction.project_id == Project.id)  # NEW: Join projects
-
-        total = query.count()
-        interactions = query.offset((page - 1) * per_page).limit(per_page).all()
-
-        response_data = {
-            "interactions": [{
-                "id": i.id,
-                "contact_date": i.contact_date.isoformat(),
-                "follow_up": i.follow_up.isoformat() if i.follow_up else None,
-                "summary": i.summary,
-                "outcome": i.outcome,
-                "notes": i.notes,
-                "client_id": i.client_id,
-                "lead_id": i.lead_id,
-                "project_id": i.project_id,  # NEW: Include project_id
-                "client_name": i.client.name if i.client else None,
-                "lead_name": i.lead.name if i.lead else None,
-                "project_name": i.project.project_name if i.project else None,  # NEW: Project name
-                "contact_person": (
-                    i.contact_person.strip() if i.contact_person and i.contact_person.strip()
-                    else i.client.contact_person if i.client
-                    else i.lead.contact_person if i.lead
-                    else i.project.primary_contact_name if i.project  # NEW: Project contact
-                    else None
-                ),
-                "email": (
-                    i.email or
-                    (i.client.email if i.client else None) or
-                    (i.lead.email if i.lead else None) or
-                    (i.project.primary_contact_email if i.project else None)  # NEW: Project email
-                ),
-                "phone": (
-                    i.phone or
-                    (i.client.phone if i.client else None) or
-                    (i.lead.phone if i.lead else None) or
-                    (i.project.primary_contact_phone if i.project else None)  # NEW: Project phone
                 ),
-                "followup_status": i.followup_status.value if i.followup_status else None,
-                "profile_link": (
-                    f"/clients/{i.client_id}" if i.client_id else
-                    f"/leads/{i.lead_id}" if i.lead_id else
-                    f"/projects/{i.project_id}" if i.project_id else None  # NEW: Project link
+                # Lead interactions
+                and_(
+                    Interaction.lead_id != None,
+                    or_(
+                        Interaction.lead.has(Lead.assigned_user.has(User.email == user_email)),
+                        Interaction.lead.has(Lead.created_by_user.has(User.email == user_email))
+                    )
                 ),
-                "assigned_to_name": (
-                    i.client.assigned_user.email if i.client and i.client.assigned_user
-                    else i.client.created_by_user.email if i.client and i.client.created_by_user
-                    else i.lead.assigned_user.email if i.lead and i.lead.assigned_user
-                    else i.lead.created_by_user.email if i.lead and i.lead.created_by_user
-                    else None  # NOTE: Projects don't have assigned_to yet, only created_by
+                # Project interactions - NEW: Add project filtering
+                and_(
+                    Interaction.project_id != None,
+                    Interaction.project.has(Project.created_by == 
+                        session.query(User.id).filter(User.email == user_email).scalar_subquery()
+                    )
                 )
-            } for i in interactions],
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "sort_order": sort_order,
-            "user_email": user_email
-        }
+            )
+        )
 
-        response = jsonify(response_data)
-        response.headers["Cache-Control"] = "no-store"
-        return response
-    finally:
-        session.close()
\ No newline at end of file
+    # Apply sorting
+    if sort_order == "newest":
+        query = query.order_by(Interaction.contact_date.desc())
+    elif sort_order == "oldest":
+        query = query.order_by(Interaction.contact_date.asc())
+    elif sort_order == "alphabetical":
+        # Sort by entity name alphabetically
+        query = query.order_by(
+            func.coalesce(Client.name, Lead.name, Project.project_name).asc()  # NEW: Include project name
+        ).outerjoin(Client, Interaction.client_id == Client.id)\
+         .outerjoin(Lead, Interaction.lead_id == Lead.id)\
+         .outerjoin(Project, Interaction.project_id == Project.id)  # NEW: Join projects
+
+    total = query.count()
+    interactions = query.offset((page - 1) * per_page).limit(per_page).all()
+
+    response_data = {
+        "interactions": [{
+            "id": i.id,
+            "contact_date": i.contact_date.isoformat(),
+            "follow_up": i.follow_up.isoformat() if i.follow_up else None,
+            "summary": i.summary,
+            "outcome": i.outcome,
+            "notes": i.notes,
+            "client_id": i.client_id,
+            "lead_id": i.lead_id,
+            "project_id": i.project_id,  # NEW: Include project_id
+            "client_name": i.client.name if i.client else None,
+            "lead_name": i.lead.name if i.lead else None,
+            "project_name": i.project.project_name if i.project else None,  # NEW: Project name
+            "contact_person": (
+                i.contact_person.strip() if i.contact_person and i.contact_person.strip()
+                else i.client.contact_person if i.client
+                else i.lead.contact_person if i.lead
+                else i.project.primary_contact_name if i.project  # NEW: Project contact
+                else None
+            ),
+            "email": (
+                i.email or
+                (i.client.email if i.client else None) or
+                (i.lead.email if i.lead else None) or
+                (i.project.primary_contact_email if i.project else None)  # NEW: Project email
+            ),
+            "phone": (
+                i.phone or
+                (i.client.phone if i.client else None) or
+                (i.lead.phone if i.lead else None) or
+                (i.project.primary_contact_phone if i.project else None)  # NEW: Project phone
+            ),
+            "followup_status": i.followup_status.value if i.followup_status else None,
+            "profile_link": (
+                f"/clients/{i.client_id}" if i.client_id else
+                f"/leads/{i.lead_id}" if i.lead_id else
+                f"/projects/{i.project_id}" if i.project_id else None  # NEW: Project link
+            ),
+            "assigned_to_name": (
+                i.client.assigned_user.email if i.client and i.client.assigned_user
+                else i.client.created_by_user.email if i.client and i.client.created_by_user
+                else i.lead.assigned_user.email if i.lead and i.lead.assigned_user
+                else i.lead.created_by_user.email if i.lead and i.lead.created_by_user
+                else None  # NOTE: Projects don't have assigned_to yet, only created_by
+            )
+        } for i in interactions],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "sort_order": sort_order,
+        "user_email": user_email
+    }
+
+    response = jsonify(response_data)
+    response.headers["Cache-Control"] = "no-store"
+    return response
\ No newline at end of file
@@ -1,93 +1,168 @@
 from quart import Blueprint, request, jsonify
 from datetime import datetime
-from app.models import Lead, ActivityLog, ActivityType, User
-from app.database import SessionLocal
+from app.models import Lead, ActivityType, User
+from app.database import AsyncSessionLocal
 from app.utils.auth_utils import requires_auth
+from app.utils.activity_log import enqueue_activity_log
 from app.utils.email_utils import send_assignment_notification
 from app.utils.phone_utils import clean_phone_number
 from app.constants import TYPE_OPTIONS, LEAD_STATUS_OPTIONS, PHONE_LABELS
-from sqlalchemy import or_, and_
-from sqlalchemy.orm import joinedload
+from app.utils.orjson_response import orjson_response
+from app.utils.http_cache import make_etag, not_modified, set_etag
+from sqlalchemy import or_, and_, bindparam, case, func, select, update
+from sqlalchemy.orm import aliased, raiseload, selectinload
 
 leads_bp = Blueprint("leads", __name__, url_prefix="/api/leads")
 
+# Columns serialized by the lead list endpoints
+LEAD_LIST_COLUMNS = (
+    Lead.id, Lead.name, Lead.contact_person, Lead.contact_title,
+    Lead.email, Lead.phone, Lead.phone_label,
+    Lead.secondary_phone, Lead.secondary_phone_label,
+    Lead.address, Lead.city, Lead.state, Lead.zip, Lead.notes,
+    Lead.created_at, Lead.assigned_to, Lead.lead_status,
+    Lead.converted_on, Lead.type,
+)
+
+
+# Eager-loading convention for ORM lead queries: joinedload for many-to-one
+# relationships, selectinload for collections (a JOIN against a collection
+# repeats the lead row once per child), raiseload for everything else so an
+# unplanned lazy load fails loudly. The list endpoints select columns
+# directly and need none of this.
+def lead_detail_eager():
+    # A function because Lead.contacts is a backref, which only exists once
+    # the mappers are configured
+    return (
+        selectinload(Lead.contacts),  # the only relationship get_lead serializes
+        raiseload("*"),
+    )
+
+
+# Latest create/update time of the leads in a list, for ETags
+_LAST_CHANGE = func.max(func.coalesce(Lead.updated_at, Lead.created_at))
+
+AssignedUser = aliased(User)
+CreatedUser = aliased(User)
+
+
+def _lead_list_select(*extra_columns):
+    """Lead list columns plus the assignee (or creator) email, as a Core select."""
+    return select(
+        *LEAD_LIST_COLUMNS,
+        func.coalesce(AssignedUser.email, CreatedUser.email).label("assigned_to_name"),
+        *extra_columns,
+    ).select_from(Lead)\
+     .outerjoin(AssignedUser, Lead.assigned_to == AssignedUser.id)\
+     .outerjoin(CreatedUser, Lead.created_by == CreatedUser.id)
+
+
+_LEAD_SORTS = {
+    "newest": Lead.created_at.desc(),
+    "oldest": Lead.created_at.asc(),
+    "alphabetical": Lead.name.asc(),
+}
+
+
+def _list_statements(filters, *extra_columns):
+    """
+    Build a lead list's statements once: (count/last-change stats, {sort: page}).
+    Pages take offset/limit bind parameters alongside the filters' own.
+    """
+    stats = select(func.count(Lead.id), _LAST_CHANGE).where(*filters)
+    base = _lead_list_select(*extra_columns).where(*filters)
+    pages = {
+        sort: base.order_by(order).offset(bindparam("offset")).limit(bindparam("limit"))
+        for sort, order in _LEAD_SORTS.items()
+    }
+    return stats, pages
+
+
+# Statements are built at import time and executed with bind parameters,
+# so requests skip SQL construction and hit the compiled cache directly.
+_TENANT_LEADS = (
+    Lead.tenant_id == bindparam("tenant_id"),
+    Lead.deleted_at == None,
+)
+_OWN_LEADS = _TENANT_LEADS + (
+    or_(
+        Lead.assigned_to == bindparam("user_id"),
+        and_(
+            Lead.assigned_to == None,
+            Lead.created_by == bindparam("user_id")
+        )
+    ),
+)
+_USER_EMAIL_LEADS = _TENANT_LEADS + (
+    or_(
+        Lead.assigned_user.has(User.email == bindparam("user_email")),
+        Lead.created_by_user.has(User.email == bindparam("user_email"))
+    ),
+)
+
+OWN_LEADS_STATS, OWN_LEADS_PAGES = _list_statements(_OWN_LEADS)
+ALL_LEADS_STATS, ALL_LEADS_PAGES = _list_statements(
+    _TENANT_LEADS, CreatedUser.email.label("created_by_name")
+)
+USER_LEADS_STATS, USER_LEADS_PAGES = _list_statements(
+    _USER_EMAIL_LEADS, CreatedUser.email.label("created_by_name")
+)
+ASSIGNED_LEADS_STMT = select(*LEAD_LIST_COLUMNS).where(
+    *_TENANT_LEADS, Lead.assigned_to != None
+)
+
+
+def _editable_lead(user, lead_id):
+    """WHERE criteria for a live lead the user may edit (admins: any in the tenant)."""
+    criteria = [
+        Lead.id == lead_id,
+        Lead.tenant_id == user.tenant_id,
+        Lead.deleted_at == None
+    ]
+    if "admin" not in user.role_names:
+        criteria.append(
+            or_(
+                Lead.created_by == user.id,
+                Lead.assigned_to == user.id
+            )
+        )
+    return criteria
+
 
 @leads_bp.route("/", methods=["GET"])
 @requires_auth()
 async def list_leads():
     user = request.user
-    session = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as session:
         page = int(request.args.get("page", 1))
         per_page = int(request.args.get("per_page", 20))
         sort_order = request.args.get("sort", "newest")
         
         # Validate sort order
-        if sort_order not in ["newest", "oldest", "alphabetical"]:
+        if sort_order not in _LEAD_SORTS:
             sort_order = "newest"
 
-        query = session.query(Lead).options(
-            joinedload(Lead.assigned_user),
-            joinedload(Lead.created_by_user)
-        ).filter(
-            Lead.tenant_id == user.tenant_id,
-            Lead.deleted_at == None,
-            or_(
-                Lead.assigned_to == user.id,
-                and_(
-                    Lead.assigned_to == None,
-                    Lead.created_by == user.id
-                )
-            )
-        )
+        params = {"tenant_id": user.tenant_id, "user_id": user.id}
 
-        # Apply sorting
-        if sort_order == "newest":
-            query = query.order_by(Lead.created_at.desc())
-        elif sort_order == "oldest":
-            query = query.order_by(Lead.created_at.asc())
-        elif sort_order == "alphabetical":
-            query = query.order_by(Lead.name.asc())
+        # Count and last change are cheap to fetch and key the ETag
+        total, last_change = (await session.execute(OWN_LEADS_STATS, params)).one()
+        etag = make_etag(user.id, total, last_change, weak=True)
+        if (cached := not_modified(etag)) is not None:
+            return cached
 
-        total = query.count()
-        leads = query.offset((page - 1) * per_page).limit(per_page).all()
+        rows = (await session.execute(
+            OWN_LEADS_PAGES[sort_order],
+            {**params, "offset": (page - 1) * per_page, "limit": per_page}
+        )).mappings()
 
-        response = jsonify({
-            "leads": [{
-                "id": l.id,
-                "name": l.name,
-                "contact_person": l.contact_person,
-                "contact_title": l.contact_title,
-                "email": l.email,
-                "phone": l.phone,
-                "phone_label": l.phone_label,
-                "secondary_phone": l.secondary_phone,
-                "secondary_phone_label": l.secondary_phone_label,
-                "address": l.address,
-                "city": l.city,
-                "state": l.state,
-                "zip": l.zip,
-                "notes": l.notes,
-                "created_at": l.created_at.isoformat() + "Z",
-                "assigned_to": l.assigned_to,
-                "assigned_to_name": (
-                    l.assigned_user.email if l.assigned_user
-                    else l.created_by_user.email if l.created_by_user
-                    else None
-                ),
-                "lead_status": l.lead_status,
-                "converted_on": l.converted_on.isoformat() + "Z" if l.converted_on else None,
-                "type": l.type  
-            } for l in leads],
+        response = orjson_response({
+            "leads": [dict(row) for row in rows],
             "total": total,
             "page": page,
             "per_page": per_page,
             "sort_order": sort_order
         })
-        response.headers["Cache-Control"] = "no-store"
-        return response
-    finally:
-        session.close()
+        return set_etag(response, etag)
 
 
 @leads_bp.route("/", methods=["POST"])
@@ -96,8 +171,7 @@ async def create_lead():
     user = request.user
     data = await request.get_json()
     
-    session = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as session:
         lead_type = data.get("type", TYPE_OPTIONS[0])
         
         if lead_type not in TYPE_OPTIONS:
@@ -125,41 +199,23 @@ async def create_lead():
         )
         
         session.add(lead)
-        session.commit()
-        session.refresh(lead)
+        await session.commit()
         return jsonify({"id": lead.id}), 201
-    finally:
-        session.close()
 
 @leads_bp.route("/<int:lead_id>", methods=["GET"])
 @requires_auth()
 async def get_lead(lead_id):
     user = request.user
-    session = SessionLocal()
-    try:
-        lead_query = session.query(Lead).options(
-            joinedload(Lead.assigned_user),
-            joinedload(Lead.created_by_user)
-        ).filter(
-            Lead.id == lead_id,
-            Lead.tenant_id == user.tenant_id,
-            Lead.deleted_at == None
-        )
-
-        if not any(role.name == "admin" for role in user.roles):
-            lead_query = lead_query.filter(
-                or_(
-                    Lead.created_by == user.id,
-                    Lead.assigned_to == user.id
-                )
-            )
-
-        lead = lead_query.first()
+    async with AsyncSessionLocal() as session:
+        lead = (await session.execute(
+            select(Lead).options(*lead_detail_eager()).where(*_editable_lead(user, lead_id))
+        )).scalar_one_or_none()
 
         if not lead:
             return jsonify({"error": "Lead not found"}), 404
 
-        log = ActivityLog(
+        # Written in batches by a background task, off the request path
+        enqueue_activity_log(
             tenant_id=user.tenant_id,
             user_id=user.id,
             action=ActivityType.viewed,
@@ -167,10 +223,8 @@ async def get_lead(lead_id):
             entity_id=lead.id,
             description=f"Viewed lead '{lead.name}'"
         )
-        session.add(log)
-        session.commit()
 
-        response = jsonify({
+        payload = {
             "id": lead.id,
             "name": lead.name,
             "contact_person": lead.contact_person,
@@ -185,16 +239,16 @@ async def get_lead(lead_id):
             "state": lead.state,
             "zip": lead.zip,
             "notes": lead.notes,
-            "created_at": lead.created_at.isoformat() + "Z",
+            "created_at": lead.created_at,
             "lead_status": lead.lead_status,
-            "converted_on": lead.converted_on.isoformat() + "Z" if lead.converted_on else None,
+            "converted_on": lead.converted_on,
             "type": lead.type,
             "contacts": [c.to_dict() for c in lead.contacts] if lead.contacts else []
-        })
+        }
+
+        response = orjson_response(payload)
         response.headers["Cache-Control"] = "no-store"
         return response
-    finally:
-        session.close()
 
 
 @leads_bp.route("/<int:lead_id>", methods=["PUT"])
@@ -203,90 +257,73 @@ async def update_lead(lead_id):
     user = request.user
     data = await request.get_json()
     
-    session = SessionLocal()
-    try:
-        lead_query = session.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.tenant_id == user.tenant_id,
-            Lead.deleted_at == None
-        )
-
-        if not any(role.name == "admin" for role in user.roles):
-            lead_query = lead_query.filter(
-                or_(
-                    Lead.created_by == user.id,
-                    Lead.assigned_to == user.id
-                )
-            )
-
-        lead = lead_query.first()
-        if not lead:
-            return jsonify({"error": "Lead not found"}), 404
-
-        # Process basic fields
-        for field in [
-            "name", "contact_person", "contact_title", "email", "phone_label",
-            "secondary_phone_label", "address", "city", "state", "zip", "notes"
-        ]:
-            if field in data:
-                setattr(lead, field, data[field] or None)
+    async with AsyncSessionLocal() as session:
+        values = {
+            field: data[field] or None
+            for field in [
+                "name", "contact_person", "contact_title", "email", "phone_label",
+                "secondary_phone_label", "address", "city", "state", "zip", "notes"
+            ]
+            if field in data
+        }
 
         if "phone" in data:
-            lead.phone = clean_phone_number(data["phone"]) if data["phone"] else None
+            values["phone"] = clean_phone_number(data["phone"]) if data["phone"] else None
         if "secondary_phone" in data:
-            lead.secondary_phone = clean_phone_number(data["secondary_phone"]) if data["secondary_phone"] else None
+            values["secondary_phone"] = clean_phone_number(data["secondary_phone"]) if data["secondary_phone"] else None
 
+        now = datetime.utcnow()
         if "lead_status" in data:
             new_status = data["lead_status"]
             if new_status in LEAD_STATUS_OPTIONS:
-                if new_status == "closed" and lead.lead_status != "closed":
-                    lead.converted_on = datetime.utcnow()
-                lead.lead_status = new_status
+                if new_status == "closed":
+                    # SET sees the pre-update row, so only leads closing now get a date
+                    values["converted_on"] = case(
+                        (func.coalesce(Lead.lead_status, "") != "closed", now),
+                        else_=Lead.converted_on
+                    )
+                values["lead_status"] = new_status
 
         if "type" in data and data["type"] in TYPE_OPTIONS:
-            lead.type = data["type"]
-
-        lead.updated_by = user.id
-        lead.updated_at = datetime.utcnow()
+            values["type"] = data["type"]
+
+        values["updated_by"] = user.id
+        values["updated_at"] = now
+
+        # One round-trip: scoped UPDATE, RETURNING tells us whether it matched
+        updated = (await session.execute(
+            update(Lead)
+            .where(*_editable_lead(user, lead_id))
+            .values(**values)
+            .returning(Lead.id)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if not updated:
+            await session.rollback()
+            return jsonify({"error": "Lead not found"}), 404
 
-        session.commit()
-        session.refresh(lead)
-        return jsonify({"id": lead.id})
-    finally:
-        session.close()
+        await session.commit()
+        return jsonify({"id": lead_id})
 
 
 @leads_bp.route("/<int:lead_id>", methods=["DELETE"])
 @requires_auth()
 async def delete_lead(lead_id):
     user = request.user
-    session = SessionLocal()
-    try:
-        lead_query = session.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.tenant_id == user.tenant_id,
-            Lead.deleted_at == None
-        )
-
-        if not any(role.name == "admin" for role in user.roles):
-            lead_query = lead_query.filter(
-                or_(
-                    Lead.created_by == user.id,
-                    Lead.assigned_to == user.id
-                )
-            )
-
-        lead = lead_query.first()
-        if not lead:
+    async with AsyncSessionLocal() as session:
+        deleted = (await session.execute(
+            update(Lead)
+            .where(*_editable_lead(user, lead_id))
+            .values(deleted_at=datetime.utcnow(), deleted_by=user.id)
+            .returning(Lead.id)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if not deleted:
+            await session.rollback()
             return jsonify({"error": "Lead not found"}), 404
 
-        lead.deleted_at = datetime.utcnow()
-        lead.deleted_by = user.id
-        session.commit()
+        await session.commit()
         return jsonify({"message": "Lead soft-deleted successfully"})
-    finally:
-        session.close()
-
 
 
 @leads_bp.route("/<int:lead_id>/assign", methods=["PUT"])
@@ -296,66 +333,63 @@ async def assign_lead(lead_id):
     data = await request.get_json()
     assigned_to = data.get("assigned_to")
 
-    session = SessionLocal()
     try:
-        lead = session.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.tenant_id == user.tenant_id,
-            Lead.deleted_at == None
-        ).first()
-
-        if not lead:
-            return jsonify({"error": "Lead not found"}), 404
-
-        # Validate that assigned_to is a valid user
-        if assigned_to:
-            assigned_user = session.query(User).filter(
-                User.id == assigned_to,
-                User.tenant_id == user.tenant_id,
-                User.is_active == True
-            ).first()
+        async with AsyncSessionLocal() as session:
+            lead = (await session.execute(select(Lead).where(
+                Lead.id == lead_id,
+                Lead.tenant_id == user.tenant_id,
+                Lead.deleted_at == None
+            ))).scalar_one_or_none()
+
+            if not lead:
+                return jsonify({"error": "Lead not found"}), 404
+
+            # Validate that assigned_to is a valid user
+            if assigned_to:
+                assigned_user = (await session.execute(select(User).where(
+                    User.id == assigned_to,
+                    User.tenant_id == user.tenant_id,
+                    User.is_active == True
+                ))).scalar_one_or_none()
             
-            if not assigned_user:
-                return jsonify({"error": f"User {assigned_to} not found or not active"}), 400
-
-        lead.assigned_to = assigned_to
-        lead.updated_by = user.id
-        lead.updated_at = datetime.utcnow()
-
-        # Send email to assigned user (before commit in case it fails)
-        if assigned_to:
-            assigned_user = session.query(User).get(assigned_to)
-            if assigned_user:
-                try:
-                    await send_assignment_notification(
-                        to_email=assigned_user.email,
-                        entity_type="lead",
-                        entity_name=lead.name,
-                        assigned_by=user.email
-                    )
-                except Exception as email_error:
-                    print(f"DEBUG: Email notification failed: {email_error}")
-                    # Don't fail the assignment if email fails
-
-        try:
-            session.commit()
-            return jsonify({"message": "Lead assigned successfully"})
-        except Exception as e:
-            session.rollback()
-            return jsonify({"error": f"Database error: {str(e)}"}), 500
+                if not assigned_user:
+                    return jsonify({"error": f"User {assigned_to} not found or not active"}), 400
+
+            lead.assigned_to = assigned_to
+            lead.updated_by = user.id
+            lead.updated_at = datetime.utcnow()
+
+            # Send email to assigned user (before commit in case it fails)
+            if assigned_to:
+                assigned_user = await session.get(User, assigned_to)
+                if assigned_user:
+                    try:
+                        await send_assignment_notification(
+                            to_email=assigned_user.email,
+                            entity_type="lead",
+                            entity_name=lead.name,
+                            assigned_by=user.email
+                        )
+                    except Exception as email_error:
+                        print(f"DEBUG: Email notification failed: {email_error}")
+                        # Don't fail the assignment if email fails
+
+            try:
+                await session.commit()
+                return jsonify({"message": "Lead assigned successfully"})
+            except Exception as e:
+                await session.rollback()
+                return jsonify({"error": f"Database error: {str(e)}"}), 500
 
     except Exception as e:
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
-    finally:
-        session.close()
 
 
 @leads_bp.route("/all", methods=["GET"])
 @requires_auth(roles=["admin"])
 async def list_all_leads_admin():
     user = request.user
-    session = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as session:
         # Get pagination parameters
         page = int(request.args.get("page", 1))
         per_page = int(request.args.get("per_page", 20))
@@ -363,65 +397,31 @@ async def list_all_leads_admin():
         user_email = request.args.get("user_email")  # Filter by specific user
         
         # Validate sort order
-        if sort_order not in ["newest", "oldest", "alphabetical"]:
+        if sort_order not in _LEAD_SORTS:
             sort_order = "newest"
 
-        query = session.query(Lead).options(
-            joinedload(Lead.assigned_user),
-            joinedload(Lead.created_by_user)
-        ).filter(
-            Lead.tenant_id == user.tenant_id,
-            Lead.deleted_at == None
-        )
+        params = {"tenant_id": user.tenant_id}
 
         # Filter by user if specified
         if user_email:
-            query = query.filter(
-                or_(
-                    Lead.assigned_user.has(User.email == user_email),
-                    Lead.created_by_user.has(User.email == user_email)
-                )
-            )
+            stats_stmt, page_stmts = USER_LEADS_STATS, USER_LEADS_PAGES
+            params["user_email"] = user_email
+        else:
+            stats_stmt, page_stmts = ALL_LEADS_STATS, ALL_LEADS_PAGES
 
-        # Apply sorting
-        if sort_order == "newest":
-            query = query.order_by(Lead.created_at.desc())
-        elif sort_order == "oldest":
-            query = query.order_by(Lead.created_at.asc())
-        elif sort_order == "alphabetical":
-            query = query.order_by(Lead.name.asc())
+        # Count and last change are cheap to fetch and key the ETag
+        total, last_change = (await session.execute(stats_stmt, params)).one()
+        etag = make_etag(user.id, total, last_change, weak=True)
+        if (cached := not_modified(etag)) is not None:
+            return cached
 
-        total = query.count()
-        leads = query.offset((page - 1) * per_page).limit(per_page).all()
+        rows = (await session.execute(
+            page_stmts[sort_order],
+            {**params, "offset": (page - 1) * per_page, "limit": per_page}
+        )).mappings()
 
         response_data = {
-            "leads": [{
-                "id": l.id,
-                "name": l.name,
-                "contact_person": l.contact_person,
-                "contact_title": l.contact_title,
-                "email": l.email,
-                "phone": l.phone,
-                "phone_label": l.phone_label,
-                "secondary_phone": l.secondary_phone,
-                "secondary_phone_label": l.secondary_phone_label,
-                "address": l.address,
-                "city": l.city,
-                "state": l.state,
-                "zip": l.zip,
-                "notes": l.notes,
-                "assigned_to": l.assigned_to,
-                "created_at": l.created_at.isoformat() + "Z",
-                "lead_status": l.lead_status,
-                "converted_on": l.converted_on.isoformat() + "Z" if l.converted_on else None,
-                "type": l.type,
-                "assigned_to_name": (
-                    l.assigned_user.email if l.assigned_user
-                    else l.created_by_user.email if l.created_by_user
-                    else None
-                ),
-                "created_by_name": l.created_by_user.email if l.created_by_user else None,
-            } for l in leads],
+            "leads": [dict(row) for row in rows],
             "total": total,
             "page": page,
             "per_page": per_page,
@@ -429,50 +429,22 @@ async def list_all_leads_admin():
             "user_email": user_email
         }
 
-        response = jsonify(response_data)
-        response.headers["Cache-Control"] = "no-store"
-        return response
-    finally:
-        session.close()
+        response = orjson_response(response_data)
+        return set_etag(response, etag)
 
 
 @leads_bp.route("/assigned", methods=["GET"])
 @requires_auth(roles=["admin"])
 async def list_assigned_leads():
     user = request.user
-    session = SessionLocal()
-    try:
-        leads = session.query(Lead).filter(
-            Lead.tenant_id == user.tenant_id,
-            Lead.deleted_at == None,
-            Lead.assigned_to != None
-        ).all()
-
-        response = jsonify([{
-            "id": l.id,
-            "name": l.name,
-            "contact_person": l.contact_person,
-            "contact_title": l.contact_title,
-            "email": l.email,
-            "phone": l.phone,
-            "phone_label": l.phone_label,
-            "secondary_phone": l.secondary_phone,
-            "secondary_phone_label": l.secondary_phone_label,
-            "address": l.address,
-            "city": l.city,
-            "state": l.state,
-            "zip": l.zip,
-            "notes": l.notes,
-            "assigned_to": l.assigned_to,
-            "created_at": l.created_at.isoformat() + "Z",
-            "lead_status": l.lead_status,
-            "converted_on": l.converted_on.isoformat() + "Z" if l.converted_on else None,
-            "type": l.type
-        } for l in leads])
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(
+            ASSIGNED_LEADS_STMT, {"tenant_id": user.tenant_id}
+        )).mappings()
+
+        response = orjson_response([dict(row) for row in rows])
         response.headers["Cache-Control"] = "no-store"
         return response
-    finally:
-        session.close()
 
 
 @leads_bp.route("/bulk-delete", methods=["POST"])
@@ -485,62 +457,56 @@ async def bulk_delete_leads():
     if not lead_ids or not isinstance(lead_ids, list):
         return jsonify({"error": "No lead IDs provided"}), 400
 
-    session = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as session:
         # Soft delete only leads that belong to this tenant and haven't already been deleted
-        updated_count = session.query(Lead).filter(
-            Lead.tenant_id == user.tenant_id,
-            Lead.id.in_(lead_ids),
-            Lead.deleted_at == None
-        ).update(
-            {Lead.deleted_at: datetime.utcnow(), Lead.deleted_by: user.id},
-            synchronize_session=False
+        result = await session.execute(
+            update(Lead)
+            .where(
+                Lead.tenant_id == user.tenant_id,
+                Lead.id.in_(lead_ids),
+                Lead.deleted_at == None
+            )
+            .values(deleted_at=datetime.utcnow(), deleted_by=user.id)
+            .execution_options(synchronize_session=False)
         )
-        session.commit()
+        updated_count = result.rowcount
+        await session.commit()
         return jsonify({"message": f"{updated_count} lead(s) deleted"})
-    finally:
-        session.close()
 
 @leads_bp.route("/trash", methods=["GET"])
 @requires_auth()
 async def list_trashed_leads():
     user = request.user
-    session = SessionLocal()
-    try:
-        if not any(role.name == "admin" for role in user.roles):
-            trashed = session.query(Lead).filter(
-                Lead.tenant_id == user.tenant_id,
-                Lead.deleted_at != None,
+    async with AsyncSessionLocal() as session:
+        stmt = select(Lead.id, Lead.name, Lead.deleted_at, Lead.deleted_by).where(
+            Lead.tenant_id == user.tenant_id,
+            Lead.deleted_at != None
+        )
+        if "admin" not in user.role_names:
+            stmt = stmt.where(
                 or_(
                     Lead.created_by == user.id,
                     Lead.assigned_to == user.id
                 )
-            ).order_by(Lead.deleted_at.desc()).all()
-        else:
-            trashed = session.query(Lead).filter(
-                Lead.tenant_id == user.tenant_id,
-                Lead.deleted_at != None
-            ).order_by(Lead.deleted_at.desc()).all()
+            )
+        trashed = (await session.execute(stmt.order_by(Lead.deleted_at.desc()))).all()
 
-        return jsonify([
+        return orjson_response([
             {
                 "id": l.id,
                 "name": l.name,
-                "deleted_at": l.deleted_at.isoformat() + "Z",
+                "deleted_at": l.deleted_at,
                 "deleted_by": l.deleted_by
             } for l in trashed
         ])
-    finally:
-        session.close()
 
 
 @leads_bp.route("/<int:lead_id>/restore", methods=["PUT"])
 @requires_auth()
 async def restore_lead(lead_id):
     user = request.user
-    session = SessionLocal()
-    try:
-        lead = session.query(Lead).filter(
+    async with AsyncSessionLocal() as session:
+        lead = (await session.execute(select(Lead).where(
             Lead.id == lead_id,
             Lead.tenant_id == user.tenant_id,
             Lead.deleted_at != None,
@@ -548,39 +514,34 @@ async def restore_lead(lead_id):
                 Lead.created_by == user.id,
                 Lead.assigned_to == user.id,
                 # Optional: allow admin to restore any
-                User.id == user.id if any(role.name == "admin" for role in user.roles) else False
+                User.id == user.id if "admin" in user.role_names else False
             )
-        ).first()
+        ))).scalars().first()
 
         if not lead:
             return jsonify({"error": "Lead not found or not authorized to restore"}), 404
 
         lead.deleted_at = None
         lead.deleted_by = None
-        session.commit()
+        await session.commit()
         return jsonify({"message": "Lead restored successfully"})
-    finally:
-        session.close()
 
 
 @leads_bp.route("/<int:lead_id>/purge", methods=["DELETE"])
 @requires_auth(roles=["admin"])
 async def purge_lead(lead_id):
     user = request.user
-    session = SessionLocal()
-    try:
-        lead = session.query(Lead).filter(
+    async with AsyncSessionLocal() as session:
+        lead = (await session.execute(select(Lead).where(
             Lead.id == lead_id,
             Lead.tenant_id == user.tenant_id,
             Lead.deleted_at != None
-        ).first()
+        ))).scalar_one_or_none()
 
         if not lead:
             return jsonify({"error": "Lead not found or not eligible for purge"}), 404
 
-        session.delete(lead)
-        session.commit()
+        await session.delete(lead)
+        await session.commit()
         return jsonify({"message": "Lead permanently deleted"}), 200
-    finally:
-        session.close()
 
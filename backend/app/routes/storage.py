@@ -1,19 +1,26 @@
 # app/routes/storage.py
+import asyncio
 import os
 import uuid
 from datetime import datetime
-from quart import Blueprint, request, jsonify, send_file, Response, current_app
+from quart import Blueprint, request, jsonify, send_file, Response, current_app, redirect
+from sqlalchemy import func, insert, select
 from sqlalchemy.exc import SQLAlchemyError
-from app.database import SessionLocal
+from sqlalchemy.orm import selectinload
+from app.database import AsyncSessionLocal
 from app.models import File
 from app.utils.auth_utils import requires_auth
 from app.utils.storage_backend import get_storage
+from app.utils.orjson_response import orjson_response
+from app.utils.http_cache import make_etag, not_modified, set_etag
 import inspect
 
 
 
 storage_bp = Blueprint("storage", __name__, url_prefix="/api/storage")
 
+UPLOAD_CONCURRENCY = 8  # storage writes in flight per upload request
+
 def _tenant_key(tenant_id: int, stored_name: str) -> str:
     # consistent key prefix for all vendors
     return f"tenant-{tenant_id}/{stored_name}"
@@ -22,17 +29,24 @@ def _tenant_key(tenant_id: int, stored_name: str) -> str:
 @requires_auth()
 async def list_files():
     user = request.user
-    session = SessionLocal()
-    try:
-        files = (
-            session.query(File)
-            .filter(File.tenant_id == user.tenant_id)
+    async with AsyncSessionLocal() as session:
+        # Uploads raise max(id) and deletes lower the count, so together they key the ETag
+        count, last_id = (await session.execute(
+            select(func.count(File.id), func.max(File.id))
+            .where(File.tenant_id == user.tenant_id)
+        )).one()
+        etag = make_etag(user.id, count, last_id, weak=True)
+        if (cached := not_modified(etag)) is not None:
+            return cached
+
+        # to_dict() reads uploader, which can't lazy-load on an AsyncSession
+        files = (await session.scalars(
+            select(File)
+            .options(selectinload(File.uploader))
+            .where(File.tenant_id == user.tenant_id)
             .order_by(File.uploaded_at.desc())
-            .all()
-        )
-        return jsonify([f.to_dict() for f in files])
-    finally:
-        session.close()
+        )).all()
+        return set_etag(orjson_response([f.to_dict() for f in files]), etag)
 
 @storage_bp.route("/upload", methods=["POST"])
 @requires_auth(roles=["file_uploads"])
@@ -48,107 +62,140 @@ async def upload_files():
     max_size = current_app.config.get("MAX_CONTENT_LENGTH", 20 * 1024 * 1024)  # 20MB default
     storage = get_storage()
 
-    session = SessionLocal()
-    saved = []
-    try:
-        for file in items:
-            # Determine size (read into memory for MVP)
-            file.stream.seek(0, os.SEEK_END)
-            size = file.stream.tell()
-            file.stream.seek(0)
-
-            if size > max_size:
-                return jsonify({"error": f"File {file.filename} exceeds max size"}), 413
-
-            ext = os.path.splitext(file.filename)[1]
-            stored_name = f"{uuid.uuid4().hex}{ext}"
-            key = _tenant_key(user.tenant_id, stored_name)
+    # Check every size before anything is written to storage
+    sizes = []
+    for file in items:
+        # The part's declared length is client-supplied: good enough to reject
+        # early, but the stored size is measured by seeking to the end, which
+        # doesn't read the upload into memory
+        if (file.content_length or 0) > max_size:
+            return jsonify({"error": f"File {file.filename} exceeds max size"}), 413
+        file.stream.seek(0, os.SEEK_END)
+        sizes.append(file.stream.tell())
+        file.stream.seek(0)
+
+        if sizes[-1] > max_size:
+            return jsonify({"error": f"File {file.filename} exceeds max size"}), 413
+
+    limit = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    async def _save(file, size):
+        ext = os.path.splitext(file.filename)[1]
+        stored_name = f"{uuid.uuid4().hex}{ext}"
+        key = _tenant_key(user.tenant_id, stored_name)
+        mimetype = file.mimetype or "application/octet-stream"
+
+        async with limit:
+            await storage.put_stream(key, file.stream, mimetype)
+
+        # Persist: for local we store absolute path; for S3 we store the key
+        local_path = await storage.local_path_for(key)
+        return {
+            "tenant_id": user.tenant_id,
+            "user_id": user.id,
+            "filename": file.filename,
+            "stored_name": stored_name,
+            "path": local_path if local_path else key,
+            "size": size,
+            "mimetype": mimetype,
+            "uploaded_at": datetime.utcnow(),
+        }
 
-            try:
-                data = file.read()
-                mimetype = file.mimetype or "application/octet-stream"
-                await storage.put_bytes(key, data, mimetype)
-
-                # Persist: for local we store absolute path; for S3 we store the key
-                local_path = await storage.local_path_for(key)
-                stored_path = local_path if local_path else key
-            except Exception as e:
-                session.rollback()
-                return jsonify(
-                    {"error": f"Storage error: {type(e).__name__}", "detail": str(e)}
-                ), 500
-
-            rec = File(
-                tenant_id=user.tenant_id,
-                user_id=user.id,
-                filename=file.filename,
-                stored_name=stored_name,
-                path=stored_path,
-                size=size,
-                mimetype=mimetype,
-                uploaded_at=datetime.utcnow(),
-            )
-            session.add(rec)
-            session.flush()
-            saved.append(rec)
-
-        session.commit()
-        return jsonify([r.to_dict() for r in saved]), 201
-    except SQLAlchemyError:
-        session.rollback()
-        return jsonify({"error": "Database error"}), 500
-    finally:
-        session.close()
+    # Storage writes run concurrently; total latency is the slowest put, not the sum
+    results = await asyncio.gather(
+        *(_save(file, size) for file, size in zip(items, sizes)),
+        return_exceptions=True,
+    )
+    for e in results:
+        if isinstance(e, BaseException):
+            return jsonify(
+                {"error": f"Storage error: {type(e).__name__}", "detail": str(e)}
+            ), 500
+
+    async with AsyncSessionLocal() as session:
+        try:
+            # One INSERT for every uploaded file; RETURNING gives back the new ids
+            saved = (await session.execute(
+                insert(File).returning(
+                    File.id, File.filename, File.size, File.mimetype, File.uploaded_at
+                ),
+                results,
+            )).all()
+            await session.commit()
+        except SQLAlchemyError:
+            await session.rollback()
+            return jsonify({"error": "Database error"}), 500
+
+    # Same shape as File.to_dict(); the uploader is the current user
+    return orjson_response([{
+        "id": r.id,
+        "name": r.filename,
+        "size": r.size,
+        "uploadedBy": user.email,
+        "date": r.uploaded_at,
+        "mimetype": r.mimetype,
+    } for r in saved], status=201)
 
 @storage_bp.route("/download/<int:file_id>", methods=["GET"])
 @requires_auth()
 async def download_file(file_id: int):
     user = request.user
-    session = SessionLocal()
-    try:
-        rec = (
-            session.query(File)
-            .filter(File.id == file_id, File.tenant_id == user.tenant_id)
-            .first()
+    async with AsyncSessionLocal() as session:
+        rec = (await session.execute(
+            select(File).where(File.id == file_id, File.tenant_id == user.tenant_id)
+        )).scalar_one_or_none()
+    if not rec:
+        return jsonify({"error": "File not found"}), 404
+
+    # stored_name is a fresh UUID per upload, so the content behind it never changes
+    etag = make_etag(rec.stored_name)
+    if (cached := not_modified(etag)) is not None:
+        return cached
+
+    # Backward‑compatible: if this record has a local absolute path and exists, serve it
+    if os.path.isabs(rec.path) and os.path.exists(rec.path):
+        response = await send_file(
+            rec.path,
+            as_attachment=True,
+            attachment_filename=rec.filename,  # keep your existing arg
+            mimetype=rec.mimetype,
         )
-        if not rec:
-            return jsonify({"error": "File not found"}), 404
+        return set_etag(response, etag)
 
-        # Backward‑compatible: if this record has a local absolute path and exists, serve it
-        if os.path.isabs(rec.path) and os.path.exists(rec.path):
-            return await send_file(
-                rec.path,
-                as_attachment=True,
-                attachment_filename=rec.filename,  # keep your existing arg
-                mimetype=rec.mimetype,
-            )
+    # Otherwise treat File.path as an object key in S3‑compatible storage
+    storage = get_storage()
 
-        # Otherwise treat File.path as an object key in S3‑compatible storage
-        storage = get_storage()
-        try:
-            data, content_type = await storage.get_bytes(rec.path)
-        except Exception:
-            return jsonify({"error": "File not found in storage"}), 404
+    # Let the bucket serve the bytes directly. Off by default: the browser
+    # follows the redirect cross-origin, so the bucket needs CORS rules for
+    # the frontend origins first.
+    if current_app.config.get("S3_PRESIGNED_DOWNLOADS"):
+        url = await storage.presigned_get(
+            rec.path, rec.filename,
+            expires=current_app.config.get("S3_PRESIGNED_EXPIRES", 300),
+        )
+        if url:
+            return redirect(url, 302)
 
-        headers = {
-            "Content-Type": content_type or rec.mimetype or "application/octet-stream",
-            "Content-Disposition": f'attachment; filename="{rec.filename}"',
-        }
-        return Response(data, headers=headers)
-    finally:
-        session.close()
+    try:
+        chunks, content_type = await storage.stream_bytes(rec.path)
+    except Exception:
+        return jsonify({"error": "File not found in storage"}), 404
+
+    headers = {
+        "Content-Type": content_type or rec.mimetype or "application/octet-stream",
+        "Content-Disposition": f'attachment; filename="{rec.filename}"',
+    }
+    # Stream chunks as they arrive instead of holding the whole object in memory
+    return set_etag(Response(chunks, headers=headers), etag)
 
 @storage_bp.route("/delete/<int:file_id>", methods=["DELETE"])
 @requires_auth(roles=["file_uploads"])
 async def delete_file(file_id: int):
     user = request.user
-    session = SessionLocal()
-    try:
-        rec = (
-            session.query(File)
-            .filter(File.id == file_id, File.tenant_id == user.tenant_id)
-            .first()
-        )
+    async with AsyncSessionLocal() as session:
+        rec = (await session.execute(
+            select(File).where(File.id == file_id, File.tenant_id == user.tenant_id)
+        )).scalar_one_or_none()
         if not rec:
             return jsonify({"error": "File not found"}), 404
 
@@ -166,8 +213,6 @@ async def delete_file(file_id: int):
             except Exception:
                 pass
 
-        session.delete(rec)
-        session.commit()
+        await session.delete(rec)
+        await session.commit()
         return jsonify({"message": "Deleted"})
-    finally:
-        session.close()
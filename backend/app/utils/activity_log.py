@@ -0,0 +1,60 @@
+"""
+Batched ActivityLog writes kept off the request path
+"""
+import asyncio
+from datetime import datetime
+from app.database import SessionLocal
+from app.models import ActivityLog
+
+FLUSH_INTERVAL = 0.1  # seconds to let concurrent views pile up
+MAX_BATCH = 200
+MAX_QUEUED = 10_000  # bounds memory if the flush task is down or falling behind
+
+_queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUED)
+_dropped = 0
+
+
+def enqueue_activity_log(**fields):
+    """
+    Queue an ActivityLog row (same keyword arguments as the model).
+    The row is written by the flush_activity_logs background task; if the
+    queue is full the row is dropped and counted rather than failing the request.
+    """
+    global _dropped
+    fields.setdefault("timestamp", datetime.now())
+    try:
+        _queue.put_nowait(fields)
+    except asyncio.QueueFull:
+        _dropped += 1
+        if _dropped % 1000 == 1:
+            print(f"[ActivityLog] Queue full, dropped {_dropped} log(s) so far")
+
+
+def _write_batch(batch):
+    session = SessionLocal()
+    try:
+        session.bulk_insert_mappings(ActivityLog, batch)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"[ActivityLog] Failed to write {len(batch)} log(s): {e}")
+    finally:
+        session.close()
+
+
+async def flush_activity_logs():
+    batch = []
+    try:
+        while True:
+            batch.append(await _queue.get())
+            await asyncio.sleep(FLUSH_INTERVAL)
+            while len(batch) < MAX_BATCH and not _queue.empty():
+                batch.append(_queue.get_nowait())
+            pending, batch = batch, []
+            await asyncio.to_thread(_write_batch, pending)
+    finally:
+        # Don't drop logs that are still queued when the app shuts down
+        while not _queue.empty():
+            batch.append(_queue.get_nowait())
+        if batch:
+            _write_batch(batch)
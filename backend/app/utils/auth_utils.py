@@ -61,6 +61,8 @@ def requires_auth(roles: list = None):
             if roles and not any(role in payload["roles"] for role in roles):
                 return jsonify({"error": "Forbidden"}), 403
 
+            # Roles are already loaded with the user; keep their names for O(1) checks
+            user.role_names = frozenset(role.name for role in user.roles)
             request.user = user
             return await fn(*args, **kwargs)
         return decorated
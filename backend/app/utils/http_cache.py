@@ -0,0 +1,37 @@
+"""
+ETag helpers for conditional GET responses
+"""
+from datetime import datetime
+from typing import Optional
+from quart import Response, request
+from werkzeug.http import unquote_etag
+
+DEFAULT_CACHE_CONTROL = "private, no-cache"  # cache, but revalidate every time
+
+
+def make_etag(*parts, weak: bool = False) -> str:
+    """
+    Join parts into a quoted ETag, e.g. make_etag(3, 120) -> '"3-120"'.
+    Datetimes are rendered with isoformat(); None becomes "none".
+    """
+    tag = "-".join(
+        "none" if p is None else p.isoformat() if isinstance(p, datetime) else str(p)
+        for p in parts
+    )
+    return f'W/"{tag}"' if weak else f'"{tag}"'
+
+
+def not_modified(etag: str, cache_control: str = DEFAULT_CACHE_CONTROL) -> Optional[Response]:
+    """
+    Return a 304 response if the request's If-None-Match matches etag, else None.
+    """
+    tag, _ = unquote_etag(etag)
+    if request.if_none_match.contains_weak(tag):
+        return Response(status=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+
+def set_etag(response: Response, etag: str, cache_control: str = DEFAULT_CACHE_CONTROL) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
@@ -1,11 +1,160 @@
 """
 Utility functions for data import operations
 """
+import codecs
+import csv
+import io
 import re
-from typing import Optional, Dict, Any
+from itertools import islice
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+import openpyxl
 import pandas as pd
 from app.utils.phone_utils import clean_phone_number
 
+CSV_CHUNK_SIZE = 64 * 1024
+PREVIEW_SNIFF_BYTES = 1024 * 1024  # enough to cover the rows a preview decodes
+
+
+def _detect_csv_encoding(stream, limit: Optional[int] = None) -> str:
+    """
+    Return "utf-8-sig" if the stream decodes as UTF-8, else "latin1".
+    Validates chunk by chunk so the upload is never held in memory twice;
+    with limit, only the first limit bytes are checked.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    read = 0
+    try:
+        while True:
+            chunk = stream.read(CSV_CHUNK_SIZE)
+            if not chunk:
+                decoder.decode(b"", final=True)
+                return "utf-8-sig"
+            decoder.decode(chunk)
+            read += len(chunk)
+            if limit is not None and read >= limit:
+                # A multibyte character cut at the limit is left pending, not an error
+                return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "latin1"
+    finally:
+        stream.seek(0)
+
+
+def read_csv_rows(stream, sniff_limit: Optional[int] = None) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """
+    Stream a CSV upload as (headers, iterator of row dicts).
+    Values are raw strings; empty cells are "".
+    sniff_limit bounds encoding detection for callers that only read the first
+    rows; undecodable bytes past it are replaced instead of raising.
+    """
+    encoding = _detect_csv_encoding(stream, sniff_limit)
+    errors = "strict" if sniff_limit is None else "replace"
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding=encoding, errors=errors, newline=""))
+    headers = [str(h).strip() for h in (reader.fieldnames or [])]
+    reader.fieldnames = headers
+    return headers, iter(reader)
+
+
+def read_xlsx_rows(stream) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """
+    Lazily read the first sheet of an XLSX upload as (headers, iterator of row dicts).
+    Empty cells are None; fully blank rows are skipped.
+    """
+    workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    return _xlsx_sheet_rows(workbook)
+
+
+def _xlsx_sheet_rows(workbook) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """Rows of an open workbook's first sheet; the workbook closes when they run out."""
+    sheet = workbook.worksheets[0]
+    # Read-only iteration stops at the recorded dimensions, which some writers
+    # get wrong (e.g. "A1"); read until the sheet data actually ends
+    sheet.reset_dimensions()
+    values = sheet.iter_rows(values_only=True)
+    headers = [
+        str(h).strip() if h is not None else f"Unnamed: {i}"
+        for i, h in enumerate(next(values, ()))
+    ]
+
+    def rows():
+        try:
+            for row in values:
+                if all(v is None for v in row):
+                    continue
+                yield dict(zip(headers, row))
+        finally:
+            workbook.close()
+
+    return headers, rows()
+
+
+def read_rows(file_storage, sniff_limit: Optional[int] = None) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """
+    Dispatch an uploaded .csv/.xlsx file to the matching row reader.
+    Reads from the upload stream, which Quart already spools to a temp file
+    for large parts, so the upload is never copied into memory.
+    """
+    filename = file_storage.filename.lower()
+    file_storage.stream.seek(0)
+    if filename.endswith(".csv"):
+        return read_csv_rows(file_storage.stream, sniff_limit)
+    elif filename.endswith(".xlsx"):
+        return read_xlsx_rows(file_storage.stream)
+    raise ValueError("Unsupported file format")
+
+
+def _count_csv_lines(stream) -> int:
+    """Newlines in the raw bytes, plus a final line without one; no field parsing."""
+    lines = 0
+    last = b""
+    while chunk := stream.read(CSV_CHUNK_SIZE):
+        lines += chunk.count(b"\n")
+        last = chunk
+    if last and not last.endswith(b"\n"):
+        lines += 1
+    return lines
+
+
+def read_preview(file_storage, limit: int) -> Tuple[List[str], List[Dict[str, Any]], Optional[int]]:
+    """
+    Read the first `limit` rows of an uploaded .csv/.xlsx file as
+    (headers, row dicts, total data rows), without parsing the rest.
+    The total is exact when the file ends within the preview. Otherwise it is
+    an estimate: CSV counts raw lines (blank lines and newlines inside quoted
+    cells included); XLSX uses the sheet's recorded dimensions, or None when
+    that record is missing or contradicts the rows already read.
+    """
+    filename = file_storage.filename.lower()
+    stream = file_storage.stream
+    stream.seek(0)
+    if filename.endswith(".csv"):
+        estimate = max(_count_csv_lines(stream) - 1, 0)
+        stream.seek(0)
+        headers, rows = read_csv_rows(stream, sniff_limit=PREVIEW_SNIFF_BYTES)
+    elif filename.endswith(".xlsx"):
+        # One load serves both the dimensions and the preview rows
+        workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+        max_row = workbook.worksheets[0].max_row
+        estimate = None if max_row is None else max_row - 1
+        headers, rows = _xlsx_sheet_rows(workbook)
+    else:
+        raise ValueError("Unsupported file format")
+
+    try:
+        preview = list(islice(rows, limit))
+        if next(rows, None) is None:
+            return headers, preview, len(preview)
+        if estimate is not None and estimate <= len(preview):
+            estimate = None  # dimensions say fewer rows than we've already seen
+        return headers, preview, estimate
+    finally:
+        if hasattr(rows, "close"):
+            rows.close()  # closes the XLSX workbook early
+
+
+# Basic email regex
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 def validate_email(email: str) -> Optional[str]:
     """
@@ -18,9 +167,7 @@ def validate_email(email: str) -> Optional[str]:
     if not email_str:
         return None
     
-    # Basic email regex
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if re.match(email_pattern, email_str):
+    if _EMAIL_PATTERN.match(email_str):
         return email_str
     
     return None
@@ -1,6 +1,6 @@
 import asyncio
 from sqlalchemy import text
-from app.database import SessionLocal
+from app.database import SessionLocal, engine, async_engine
 
 async def keep_db_alive():
     while True:
@@ -9,6 +9,7 @@ async def keep_db_alive():
             session.execute(text("SELECT 1"))  # ✅ required by SQLAlchemy 2+
             session.close()
             print("[KeepAlive] DB pinged successfully.")
+            print(f"[KeepAlive] Pool sync: {engine.pool.status()} | async: {async_engine.pool.status()}")
         except Exception as e:
             print(f"[KeepAlive] DB ping failed: {e}")
         await asyncio.sleep(300)  # every 5 minutes
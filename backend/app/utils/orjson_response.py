@@ -0,0 +1,25 @@
+"""
+orjson-backed JSON responses for list endpoints
+"""
+import orjson
+from quart import Response
+
+
+def orjson_response(data, status: int = 200, naive_utc: bool = True) -> Response:
+    """
+    Serialize data with orjson and wrap it in a JSON Response.
+
+    datetime objects can be passed as-is. Naive datetimes are treated as UTC
+    and rendered with a trailing "Z" (same output as `.isoformat() + "Z"`);
+    pass naive_utc=False for columns that store local wall-clock times so they
+    keep rendering without an offset (same output as `.isoformat()`).
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if naive_utc:
+        option |= orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+    # default=str covers types orjson doesn't know (Decimal, datetime subclasses)
+    return Response(
+        orjson.dumps(data, default=str, option=option),
+        status=status,
+        mimetype="application/json",
+    )
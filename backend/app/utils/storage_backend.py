@@ -3,22 +3,35 @@ from __future__ import annotations
 import os
 import io
 import asyncio
-from typing import Optional, Tuple
+import functools
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Tuple
 from quart import current_app
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
     from botocore.config import Config as BotoConfig
 except ImportError:
     boto3 = None
     BotoConfig = None
+    TransferConfig = None
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+S3_MAX_CONNECTIONS = 50
 
 
 class StorageBackend:
     async def put_bytes(self, key: str, data: bytes, content_type: str) -> None: ...
+    async def put_stream(self, key: str, fileobj: BinaryIO, content_type: str) -> None: ...
     async def get_bytes(self, key: str) -> Tuple[bytes, str]: ...
+    async def stream_bytes(self, key: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Tuple[AsyncIterator[bytes], str]: ...
     async def delete(self, key: str) -> None: ...
     async def local_path_for(self, key: str) -> Optional[str]: ...
+    async def presigned_get(self, key: str, filename: str, expires: int = 300) -> Optional[str]:
+        return None  # backends that can't hand out direct URLs are streamed instead
 
 
 class LocalStorageBackend(StorageBackend):
@@ -37,6 +50,13 @@ class LocalStorageBackend(StorageBackend):
                 f.write(data)
         await asyncio.to_thread(_write)
 
+    async def put_stream(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        abs_path = self._abs(key)
+        def _copy():
+            with open(abs_path, "wb") as f:
+                shutil.copyfileobj(fileobj, f, STREAM_CHUNK_SIZE)
+        await asyncio.to_thread(_copy)
+
     async def get_bytes(self, key: str):
         abs_path = self._abs(key)
         def _read():
@@ -46,6 +66,19 @@ class LocalStorageBackend(StorageBackend):
         # Content type is tracked in DB; return generic here
         return data, "application/octet-stream"
 
+    async def stream_bytes(self, key: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+        # Open eagerly so a missing file raises here, not mid-response
+        f = await asyncio.to_thread(open, self._abs(key), "rb")
+
+        async def _chunks():
+            try:
+                while chunk := await asyncio.to_thread(f.read, chunk_size):
+                    yield chunk
+            finally:
+                f.close()
+
+        return _chunks(), "application/octet-stream"
+
     async def delete(self, key: str) -> None:
         abs_path = self._abs(key)
         def _delete():
@@ -65,6 +98,10 @@ class S3StorageBackend(StorageBackend):
         cfg = BotoConfig(
             s3={"addressing_style": "path" if force_path_style else "auto"},
             signature_version="s3v4",
+            # One long-lived client per app, so size and keep its connection pool warm
+            max_pool_connections=S3_MAX_CONNECTIONS,
+            retries={"mode": "adaptive", "max_attempts": 3},
+            tcp_keepalive=True,
         )
         self.client = boto3.client(
             "s3",
@@ -75,9 +112,23 @@ class S3StorageBackend(StorageBackend):
             config=cfg,
         )
         self.bucket = bucket
+        # Multipart above 8MB, parts uploaded concurrently by boto3's transfer manager
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            max_concurrency=4,
+        )
+        # S3 calls get their own threads, one per pooled connection, so they
+        # don't queue behind everything else on the default to_thread executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=S3_MAX_CONNECTIONS, thread_name_prefix="s3"
+        )
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
 
     async def put_bytes(self, key: str, data: bytes, content_type: str) -> None:
-        await asyncio.to_thread(
+        await self._run(
             self.client.put_object,
             Bucket=self.bucket,
             Key=key,
@@ -85,29 +136,77 @@ class S3StorageBackend(StorageBackend):
             ContentType=content_type or "application/octet-stream",
         )
 
+    async def put_stream(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        await self._run(
+            self.client.upload_fileobj,
+            fileobj,
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": content_type or "application/octet-stream"},
+            Config=self.transfer_config,
+        )
+
     async def get_bytes(self, key: str) -> Tuple[bytes, str]:
-        obj = await asyncio.to_thread(self.client.get_object, Bucket=self.bucket, Key=key)
-        data = await asyncio.to_thread(obj["Body"].read)
+        obj = await self._run(self.client.get_object, Bucket=self.bucket, Key=key)
+        data = await self._run(obj["Body"].read)
         ctype = obj.get("ContentType", "application/octet-stream")
         return data, ctype
 
+    async def stream_bytes(self, key: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+        # get_object runs up front so a missing key raises before streaming starts
+        obj = await self._run(self.client.get_object, Bucket=self.bucket, Key=key)
+        body = obj["Body"]
+
+        async def _chunks():
+            try:
+                while chunk := await self._run(body.read, chunk_size):
+                    yield chunk
+            finally:
+                body.close()
+
+        return _chunks(), obj.get("ContentType", "application/octet-stream")
+
     async def delete(self, key: str) -> None:
-        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+        await self._run(self.client.delete_object, Bucket=self.bucket, Key=key)
 
     async def local_path_for(self, key: str) -> Optional[str]:
         return None  # not applicable for S3
 
+    async def presigned_get(self, key: str, filename: str, expires: int = 300) -> Optional[str]:
+        return await self._run(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+            },
+            ExpiresIn=expires,
+        )
+
+
+# Backends are built once per app; boto3 clients are expensive to create
+_cached: Dict[int, StorageBackend] = {}
+
 
 def get_storage() -> StorageBackend:
-    vendor = current_app.config.get("STORAGE_VENDOR", "local").lower()
+    app = current_app._get_current_object()
+    storage = _cached.get(id(app))
+    if storage is None:
+        storage = _cached[id(app)] = _build_storage(app.config)
+    return storage
+
+
+def _build_storage(config) -> StorageBackend:
+    vendor = config.get("STORAGE_VENDOR", "local").lower()
     if vendor == "s3":
         return S3StorageBackend(
-            endpoint_url=current_app.config["S3_ENDPOINT_URL"],
-            access_key=current_app.config["S3_ACCESS_KEY_ID"],
-            secret_key=current_app.config["S3_SECRET_ACCESS_KEY"],
-            bucket=current_app.config["S3_BUCKET"],
-            region=current_app.config.get("S3_REGION"),
-            force_path_style=current_app.config.get("S3_FORCE_PATH_STYLE", True),
+            endpoint_url=config["S3_ENDPOINT_URL"],
+            access_key=config["S3_ACCESS_KEY_ID"],
+            secret_key=config["S3_SECRET_ACCESS_KEY"],
+            bucket=config["S3_BUCKET"],
+            region=config.get("S3_REGION"),
+            force_path_style=config.get("S3_FORCE_PATH_STYLE", True),
         )
     # default: local
-    return LocalStorageBackend(current_app.config.get("STORAGE_ROOT", "./storage"))
+    return LocalStorageBackend(config.get("STORAGE_ROOT", "./storage"))
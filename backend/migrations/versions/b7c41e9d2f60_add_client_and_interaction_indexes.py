@@ -0,0 +1,38 @@
+"""add_client_and_interaction_indexes
+
+Revision ID: b7c41e9d2f60
+Revises: a51488f9ebc8
+Create Date: 2026-10-14 09:12:37.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41e9d2f60'
+down_revision: Union[str, None] = 'a51488f9ebc8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_client_tenant_creator_active', 'clients', ['tenant_id', 'created_by'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_client_tenant_assignee_active', 'clients', ['tenant_id', 'assigned_to'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_interaction_tenant_date', 'interactions', ['tenant_id', 'contact_date'], unique=False)
+    op.create_index('ix_interaction_tenant_client', 'interactions', ['tenant_id', 'client_id'], unique=False)
+    op.create_index('ix_interaction_tenant_lead', 'interactions', ['tenant_id', 'lead_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_interaction_tenant_lead', table_name='interactions')
+    op.drop_index('ix_interaction_tenant_client', table_name='interactions')
+    op.drop_index('ix_interaction_tenant_date', table_name='interactions')
+    op.drop_index('ix_client_tenant_assignee_active', table_name='clients')
+    op.drop_index('ix_client_tenant_creator_active', table_name='clients')
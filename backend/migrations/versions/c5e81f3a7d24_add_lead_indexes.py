@@ -0,0 +1,32 @@
+"""add_lead_indexes
+
+Revision ID: c5e81f3a7d24
+Revises: b7c41e9d2f60
+Create Date: 2026-10-14 11:08:52.603117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e81f3a7d24'
+down_revision: Union[str, None] = 'b7c41e9d2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_lead_tenant_creator_active', 'leads', ['tenant_id', 'created_by'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_lead_tenant_assignee_active', 'leads', ['tenant_id', 'assigned_to'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_lead_tenant_assignee_active', table_name='leads')
+    op.drop_index('ix_lead_tenant_creator_active', table_name='leads')
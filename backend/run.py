@@ -1,9 +1,17 @@
-from app import create_app
+import importlib.util
 import os
 
-app = create_app()
-
 if __name__ == "__main__":
+    from hypercorn.config import Config
+    from hypercorn.run import run
+
     port = int(os.getenv("PORT", "8000"))
-    # Quart dev server — ok for now; switch to Hypercorn/Uvicorn for prod later
-    app.run(host="0.0.0.0", port=port, use_reloader=False)
\ No newline at end of file
+    config = Config()
+    config.bind = [f"0.0.0.0:{port}"]
+    # Worker processes import the app themselves (spawned, not forked), so
+    # this supervisor never builds it or opens DB connections
+    config.application_path = "asgi:app"
+    config.workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    # uvloop isn't available on Windows; fall back to the stock asyncio loop there
+    config.worker_class = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    run(config)
@@ -20,19 +20,25 @@ def session_scope():
     finally:
         session.close()
 
-def ensure_role(session, name: str):
-    role = session.query(Role).filter_by(name=name).first()
-    if not role:
-        session.add(Role(name=name))
-        return True
-    return False
+ROLES = ("admin", "user", "file_uploads")
+
+def ensure_roles(session, names):
+    """Insert any missing roles in one statement; returns the names created."""
+    if session.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    stmt = (
+        insert(Role)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Role.name)
+    )
+    return list(session.execute(stmt).scalars())
 
 if __name__ == "__main__":
     with session_scope() as s:
-        created = []
-        for r in ("admin", "user", "file_uploads"):
-            if ensure_role(s, r):
-                created.append(r)
+        created = ensure_roles(s, ROLES)
         if created:
             print("Created roles:", ", ".join(created))
         else:
@@ -18,7 +18,7 @@ interface ColumnMapping {
 interface PreviewData {
   headers: string[];
   rows: any[][];
-  totalRows: number;
+  totalRows: number | null; // null when the server can't estimate it cheaply
 }
 
 interface ImportResult {
@@ -298,7 +298,7 @@ export default function LeadImporter() {
           <div className="bg-green-50 border border-green-200 rounded-md p-4">
             <h4 className="font-medium text-green-900 mb-2">File Processed Successfully!</h4>
             <p className="text-sm text-green-800">
-              Found {previewData.totalRows} rows with {previewData.headers.length} columns.
+              Found {previewData.totalRows ?? 'multiple'} rows with {previewData.headers.length} columns.
               Please map your columns to our lead fields below.
             </p>
           </div>
@@ -346,7 +346,7 @@ export default function LeadImporter() {
               ) : (
                 <>
                   <Upload className="h-4 w-4" />
-                  Import {previewData.totalRows} Leads
+                  Import {previewData.totalRows ?? 'All'} Leads
                 </>
               )}
             </button>